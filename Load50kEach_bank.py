@@ -4,7 +4,22 @@ from __future__ import annotations
 
 import argparse
 
-from LoadMassiveDataWith10Tabel import main as run_massive_loader
+from bank_loader import load
+from db_backends import add_connection_args
+
+# Row-count options of the 10-table loader, all set to --rows.
+ROW_COUNTS = (
+    "branches",
+    "employees",
+    "customers",
+    "accounts",
+    "transactions",
+    "loans",
+    "loan_payments",
+    "cards",
+    "card_transactions",
+    "atms",
+)
 
 
 # Kept as a separate entrypoint for backwards compatibility.
@@ -14,55 +29,24 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--rows", type=int, default=50_000)
     parser.add_argument("--batch-size", type=int, default=1_000)
-    parser.add_argument("--host", default="localhost")
-    parser.add_argument("--user", default="root")
-    parser.add_argument("--password", default="root")
-    parser.add_argument("--database", default="BankOf420")
+    parser.add_argument("--adaptive-batch", action="store_true", help="tune batch sizes per table")
+    add_connection_args(parser, "BankOf420")
     parser.add_argument("--seed", type=int, default=42)
     return parser.parse_args()
 
 
-def build_argv(args: argparse.Namespace) -> list[str]:
-    rows = str(args.rows)
-    return [
-        "--host",
-        args.host,
-        "--user",
-        args.user,
-        "--password",
-        args.password,
-        "--database",
-        args.database,
-        "--seed",
-        str(args.seed),
-        "--batch-size",
-        str(args.batch_size),
-        "--branches",
-        rows,
-        "--employees",
-        rows,
-        "--customers",
-        rows,
-        "--accounts",
-        rows,
-        "--transactions",
-        rows,
-        "--loans",
-        rows,
-        "--loan-payments",
-        rows,
-        "--cards",
-        rows,
-        "--card-transactions",
-        rows,
-        "--atms",
-        rows,
-    ]
+def loader_config(args: argparse.Namespace) -> dict:
+    return {
+        "host": args.host,
+        "user": args.user,
+        "password": args.password,
+        "database": args.database,
+        "seed": args.seed,
+        "batch_size": args.batch_size,
+        "adaptive_batch": args.adaptive_batch,
+        **dict.fromkeys(ROW_COUNTS, args.rows),
+    }
 
 
 if __name__ == "__main__":
-    import sys
-
-    cli_args = parse_args()
-    sys.argv = [sys.argv[0], *build_argv(cli_args)]
-    run_massive_loader()
+    load(loader_config(parse_args()))
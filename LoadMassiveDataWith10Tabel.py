@@ -3,20 +3,104 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import importlib.util
+import os
+import queue
 import random
-from typing import Iterable
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
-import mysql.connector
-from faker import Faker
-from tqdm import tqdm
+from adaptive_batch import AdaptiveBatcher
+from counter_rng import CounterRandom, stream_key
+from dataset_export import DatasetWriter, SchemaRecorder, add_export_args
+from db_backends import (
+    MySQLBackend,
+    add_backend_args,
+    add_connection_args,
+    get_backend,
+    statement_bytes,
+    tsv_line,
+)
+from load_journal import LoadJournal, PartProgress
+from load_metrics import LoadMetrics, TableStats, add_metrics_args
+from pipeline import PUT_POLL_SECONDS, prefetch, progress
+from row_checksums import ChecksumManifest
+from schema_spec import (
+    CardNumber,
+    Choice,
+    Column,
+    DateBack,
+    DateTimeBack,
+    Fake,
+    Map,
+    MonthlyPartitions,
+    RandInt,
+    RowPlan,
+    Table,
+    Template,
+    Uniform,
+    UniqueEmail,
+    compile_ddl,
+    insert_sql,
+    spec_faker,
+)
 
+# Faker, mysql.connector, tqdm, NumPy and the process pool are imported where
+# they are first used, so that --help, importing this module and loads that
+# skip a dependency start without paying for it.
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
 
-def parse_args() -> argparse.Namespace:
+    import mysql.connector
+    import mysql.connector.pooling
+    from faker import Faker
+
+
+CITIES = [
+    "Pune",
+    "Mumbai",
+    "Nagpur",
+    "Nashik",
+    "Aurangabad",
+    "Kolhapur",
+    "Solapur",
+    "Thane",
+    "Ahmednagar",
+    "Satara",
+]
+
+# Produces rows [start, stop) in one call.
+BatchFactory = Callable[["Faker", random.Random, argparse.Namespace, int, int], list[tuple]]
+
+# Rows generated per process-pool task when --workers > 1. Fixed so that the
+# dataset does not depend on the worker count or the batch size.
+SHARD_ROWS = 10_000
+
+# Rows buffered in one temporary file before it is handed to LOAD DATA.
+LOAD_DATA_CHUNK_ROWS = 100_000
+
+# Client/server refusals of LOAD DATA LOCAL INFILE (local_infile disabled).
+LOCAL_INFILE_ERRNOS = {1148, 2068, 3948}
+
+# The binary protocol counts a statement's placeholders in 16 bits.
+MAX_PLACEHOLDERS = 65_535
+
+# ``--strategy auto`` times this many batches per insert path on each table,
+# after one warm-up batch each, before keeping the faster path.
+AUTO_TRIAL_BATCHES = 3
+AUTO_TRIAL_ORDER = ("executemany", "prepared")
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--host", default="localhost")
-    parser.add_argument("--user", default="root")
-    parser.add_argument("--password", default="root")
-    parser.add_argument("--database", default="BankOf420")
+    add_connection_args(parser, "BankOf420")
     parser.add_argument("--branches", type=int, default=100)
     parser.add_argument("--employees", type=int, default=500)
     parser.add_argument("--customers", type=int, default=500_000)
@@ -29,389 +113,1529 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--atms", type=int, default=100)
     parser.add_argument("--batch-size", type=int, default=2_000)
     parser.add_argument("--seed", type=int, default=42)
-    return parser.parse_args()
-
-
-def chunks(rows: list[tuple], batch_size: int) -> Iterable[list[tuple]]:
-    for i in range(0, len(rows), batch_size):
-        yield rows[i : i + batch_size]
-
-
-def create_schema(cur: mysql.connector.cursor.MySQLCursor) -> None:
-    tables = [
-        "card_transactions",
-        "cards",
-        "loan_payments",
-        "loans",
-        "transactions",
-        "accounts",
-        "customers",
-        "employees",
-        "atm_locations",
-        "branches",
-    ]
-    for tbl in tables:
-        cur.execute(f"DROP TABLE IF EXISTS {tbl}")
-
-    cur.execute(
-        """
-        CREATE TABLE branches (
-            branch_id INT AUTO_INCREMENT PRIMARY KEY,
-            branch_name VARCHAR(100),
-            branch_code VARCHAR(20),
-            city VARCHAR(50),
-            ifsc_code VARCHAR(20)
-        )
-        """
+    parser.add_argument(
+        "--strategy",
+        choices=["executemany", "prepared", "auto", "load-data"],
+        default="executemany",
+        help="insert path: executemany (text protocol), prepared (server-side multi-row statements, "
+        "binary protocol), auto (time both on each table's first batches and keep the faster) or "
+        "load-data (falls back to executemany if local_infile is disabled)",
     )
-    cur.execute(
-        """
-        CREATE TABLE employees (
-            emp_id INT AUTO_INCREMENT PRIMARY KEY,
-            emp_name VARCHAR(100),
-            designation VARCHAR(50),
-            branch_id INT,
-            salary DECIMAL(10,2),
-            doj DATE,
-            FOREIGN KEY (branch_id) REFERENCES branches(branch_id)
-        )
-        """
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes generating rows; >1 uses per-shard seeds, so output differs from 1",
     )
-    cur.execute(
-        """
-        CREATE TABLE customers (
-            customer_id INT AUTO_INCREMENT PRIMARY KEY,
-            full_name VARCHAR(100),
-            dob DATE,
-            gender VARCHAR(10),
-            city VARCHAR(50),
-            contact_no VARCHAR(15),
-            email VARCHAR(100)
-        )
-        """
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="generate each batch a column at a time, numeric, enum and date columns as NumPy arrays",
     )
-    cur.execute(
-        """
-        CREATE TABLE accounts (
-            account_id INT AUTO_INCREMENT PRIMARY KEY,
-            customer_id INT,
-            branch_id INT,
-            account_type VARCHAR(20),
-            balance DECIMAL(12,2),
-            opening_date DATE,
-            FOREIGN KEY (customer_id) REFERENCES customers(customer_id),
-            FOREIGN KEY (branch_id) REFERENCES branches(branch_id)
-        )
-        """
+    parser.add_argument(
+        "--generator",
+        choices=["stream", "counter"],
+        default="stream",
+        help="stream: one sequential random stream per table (the default output); counter: every "
+        "row is a pure function of seed, table and row number, the same for any workers, splits or slice",
     )
-    cur.execute(
-        """
-        CREATE TABLE transactions (
-            txn_id BIGINT AUTO_INCREMENT PRIMARY KEY,
-            account_id INT,
-            txn_type VARCHAR(20),
-            amount DECIMAL(12,2),
-            txn_date DATETIME,
-            description VARCHAR(200),
-            FOREIGN KEY (account_id) REFERENCES accounts(account_id)
-        )
-        """
+    parser.add_argument(
+        "--faker-pool-size",
+        type=int,
+        default=0,
+        help="sample names, emails, phones, companies, addresses and sentences from pools "
+        "of this many precomputed values (0 = call Faker for every row)",
     )
-    cur.execute(
-        """
-        CREATE TABLE loans (
-            loan_id INT AUTO_INCREMENT PRIMARY KEY,
-            customer_id INT,
-            branch_id INT,
-            loan_type VARCHAR(50),
-            loan_amount DECIMAL(12,2),
-            interest_rate FLOAT,
-            start_date DATE,
-            FOREIGN KEY (customer_id) REFERENCES customers(customer_id),
-            FOREIGN KEY (branch_id) REFERENCES branches(branch_id)
-        )
-        """
+    parser.add_argument(
+        "--fast-load",
+        action="store_true",
+        help="load without foreign keys or per-row checks, then validate and add the keys",
     )
-    cur.execute(
-        """
-        CREATE TABLE loan_payments (
-            payment_id INT AUTO_INCREMENT PRIMARY KEY,
-            loan_id INT,
-            payment_date DATE,
-            payment_amount DECIMAL(12,2),
-            FOREIGN KEY (loan_id) REFERENCES loans(loan_id)
-        )
-        """
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=1,
+        help="pooled connections; >1 loads independent tables concurrently with per-shard seeds",
     )
-    cur.execute(
-        """
-        CREATE TABLE cards (
-            card_id INT AUTO_INCREMENT PRIMARY KEY,
-            customer_id INT,
-            card_type VARCHAR(20),
-            card_number VARCHAR(20),
-            expiry_date DATE,
-            cvv VARCHAR(4),
-            FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
-        )
-        """
+    parser.add_argument(
+        "--split",
+        action="append",
+        default=[],
+        metavar="TABLE=PARTS",
+        help="load TABLE as PARTS concurrent row ranges, e.g. transactions=4 (repeatable)",
     )
-    cur.execute(
-        """
-        CREATE TABLE card_transactions (
-            card_txn_id BIGINT AUTO_INCREMENT PRIMARY KEY,
-            card_id INT,
-            amount DECIMAL(12,2),
-            txn_date DATETIME,
-            merchant_name VARCHAR(100),
-            city VARCHAR(50),
-            FOREIGN KEY (card_id) REFERENCES cards(card_id)
-        )
-        """
+    parser.add_argument(
+        "--adaptive-batch",
+        action="store_true",
+        help="start INSERT batches at --batch-size and tune them per table from max_allowed_packet "
+        "and measured latency (executemany only)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="journal every commit and, if a journal from an interrupted run exists, continue it "
+        "instead of recreating the tables",
+    )
+    parser.add_argument("--journal", help="journal file for --resume (default: <database>.journal.json)")
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="add the row counts to the existing tables instead of recreating them; ids, unique "
+        "values and foreign key ranges continue from the rows already there",
+    )
+    parser.add_argument(
+        "--pipeline",
+        type=int,
+        nargs="?",
+        const=4,
+        default=0,
+        metavar="DEPTH",
+        help="generate batches on a producer thread while the writer inserts, with up to DEPTH "
+        "(default 4) ready batches queued",
+    )
+    parser.add_argument(
+        "--partition-by-month",
+        action="store_true",
+        help="create transactions and card_transactions RANGE-partitioned by month on txn_date "
+        "(primary key (id, txn_date), no foreign keys) and load them partition-parallel over --connections",
+    )
+    parser.add_argument(
+        "--manifest",
+        metavar="PATH",
+        help="write per-table row counts and checksums of the generated rows, per 10,000 ids, "
+        "for verify_load.py",
     )
+    add_export_args(parser)
+    add_backend_args(parser)
+    add_metrics_args(parser)
+    return parser
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = build_parser()
+    return check_args(parser, parser.parse_args(argv))
+
+
+def check_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> argparse.Namespace:
+    """Validate parsed options and derive the settings the load reads from them."""
+    args.partitions = month_partitions() if args.partition_by_month else {}
+    # Highest existing id per row-count option, filled in by --append.
+    args.existing_ids = {}
+    # Seed of the random streams; --append derives a new one so old rows are not replayed.
+    args.stream_seed = args.seed
+    args.splits = {}
+    for spec in args.split:
+        table, _, parts = spec.partition("=")
+        if table not in SCHEMA or not parts.isdigit() or int(parts) < 1:
+            parser.error(f"invalid --split {spec!r}; expected TABLE=PARTS with a known table")
+        args.splits[table] = int(parts)
+    if args.splits and args.connections < 2:
+        parser.error("--split needs --connections > 1")
+    if args.partitions.keys() & args.splits.keys():
+        parser.error("partitioned tables are loaded by partition; drop their --split")
+    if args.partitions and args.resume:
+        parser.error("--partition-by-month cannot be combined with --resume")
+    if args.partitions and args.append:
+        # Partition names follow today's date; the existing tables may have other
+        # partitions, or none at all.
+        parser.error("--partition-by-month cannot be combined with --append")
+    if args.vectorized and importlib.util.find_spec("numpy") is None:
+        parser.error("--vectorized requires numpy (pip install numpy)")
+    if args.journal is None:
+        args.journal = f"{args.database}.journal.json"
+    if args.pipeline < 0:
+        parser.error("--pipeline DEPTH must not be negative")
+    if args.resume and args.output_dir:
+        parser.error("--resume applies to database loads, not --output-dir")
+    if args.append and (args.resume or args.output_dir):
+        parser.error("--append cannot be combined with --resume or --output-dir")
+    if args.manifest and (args.resume or args.append or args.output_dir):
+        parser.error("--manifest checksums a whole fresh load; drop --resume, --append or --output-dir")
+    if args.adaptive_batch and args.strategy not in ("executemany", "auto"):
+        parser.error("--adaptive-batch applies to --strategy executemany or auto")
+    if args.backend != "mysql" and (
+        args.strategy != "executemany"
+        or args.connections > 1
+        or args.fast_load
+        or args.adaptive_batch
+        or args.resume
+        or args.partitions
+    ):
+        parser.error(
+            "--strategy, --connections, --fast-load, --adaptive-batch, --resume and --partition-by-month "
+            "are MySQL-only"
+        )
+    return args
+
+
+# Table specs in creation order (parents before children). The DDL, the
+# INSERT column lists and the row generators are all compiled from these;
+# FOREIGN KEY columns draw ids from 1 to the parent's row-count option
+# (plus its existing rows under --append).
+TABLES: list[Table] = [
+    Table(
+        "branches",
+        (
+            Column("branch_id", "INT AUTO_INCREMENT PRIMARY KEY"),
+            Column("branch_name", "VARCHAR(100)", Template("{} Branch {n}", Choice(CITIES))),
+            Column("branch_code", "VARCHAR(20)", Template("BR{n:03d}")),
+            Column("city", "VARCHAR(50)", Choice(CITIES)),
+            Column("ifsc_code", "VARCHAR(20)", Template("MAHB{n:07d}")),
+        ),
+    ),
+    Table(
+        "employees",
+        (
+            Column("emp_id", "INT AUTO_INCREMENT PRIMARY KEY"),
+            Column("emp_name", "VARCHAR(100)", Fake("name")),
+            Column("designation", "VARCHAR(50)", Choice(["Manager", "Clerk", "Cashier", "Officer"])),
+            Column("branch_id", "INT", RandInt(1, "branches"), "branches(branch_id)"),
+            Column("salary", "DECIMAL(10,2)", RandInt(30000, 90000)),
+            Column("doj", "DATE", DateBack("-5y", 1826)),
+        ),
+    ),
+    Table(
+        "customers",
+        (
+            Column("customer_id", "INT AUTO_INCREMENT PRIMARY KEY"),
+            Column("full_name", "VARCHAR(100)", Fake("name")),
+            Column("dob", "DATE", Fake("date_of_birth", minimum_age=18, maximum_age=75)),
+            Column("gender", "VARCHAR(10)", Choice(["Male", "Female"])),
+            Column("city", "VARCHAR(50)", Choice(CITIES)),
+            Column("contact_no", "VARCHAR(15)", Fake("phone_number")),
+            Column("email", "VARCHAR(100)", UniqueEmail("customers.email")),
+        ),
+    ),
+    Table(
+        "accounts",
+        (
+            Column("account_id", "INT AUTO_INCREMENT PRIMARY KEY"),
+            Column("customer_id", "INT", RandInt(1, "customers"), "customers(customer_id)"),
+            Column("branch_id", "INT", RandInt(1, "branches"), "branches(branch_id)"),
+            Column("account_type", "VARCHAR(20)", Choice(["Saving", "Current"])),
+            Column("balance", "DECIMAL(12,2)", RandInt(1000, 100000)),
+            Column("opening_date", "DATE", DateBack("-5y", 1826)),
+        ),
+    ),
+    Table(
+        "transactions",
+        (
+            Column("txn_id", "BIGINT AUTO_INCREMENT PRIMARY KEY"),
+            Column("account_id", "INT", RandInt(1, "accounts"), "accounts(account_id)"),
+            Column("txn_type", "VARCHAR(20)", Choice(["Credit", "Debit"])),
+            Column("amount", "DECIMAL(12,2)", RandInt(100, 50000)),
+            Column("txn_date", "DATETIME", DateTimeBack("-2y", 730)),
+            Column("description", "VARCHAR(200)", Fake("sentence", nb_words=6)),
+        ),
+    ),
+    Table(
+        "loans",
+        (
+            Column("loan_id", "INT AUTO_INCREMENT PRIMARY KEY"),
+            Column("customer_id", "INT", RandInt(1, "customers"), "customers(customer_id)"),
+            Column("branch_id", "INT", RandInt(1, "branches"), "branches(branch_id)"),
+            Column(
+                "loan_type",
+                "VARCHAR(50)",
+                Choice(["Home Loan", "Personal Loan", "Car Loan", "Education Loan"]),
+            ),
+            Column("loan_amount", "DECIMAL(12,2)", RandInt(100000, 2000000)),
+            Column("interest_rate", "FLOAT", Uniform(6.5, 12.5)),
+            Column("start_date", "DATE", DateBack("-5y", 1826)),
+        ),
+    ),
+    Table(
+        "loan_payments",
+        (
+            Column("payment_id", "INT AUTO_INCREMENT PRIMARY KEY"),
+            Column("loan_id", "INT", RandInt(1, "loans"), "loans(loan_id)"),
+            Column("payment_date", "DATE", DateBack("-3y", 1095)),
+            Column("payment_amount", "DECIMAL(12,2)", RandInt(2000, 50000)),
+        ),
+    ),
+    Table(
+        "cards",
+        (
+            Column("card_id", "INT AUTO_INCREMENT PRIMARY KEY"),
+            Column("customer_id", "INT", RandInt(1, "customers"), "customers(customer_id)"),
+            Column("card_type", "VARCHAR(20)", Choice(["Debit", "Credit"])),
+            Column("card_number", "VARCHAR(20)", CardNumber("cards.card_number")),
+            Column("expiry_date", "DATE", Fake("date_between", start_date="today", end_date="+5y")),
+            Column("cvv", "VARCHAR(4)", Map(str, RandInt(100, 999))),
+        ),
+    ),
+    Table(
+        "card_transactions",
+        (
+            Column("card_txn_id", "BIGINT AUTO_INCREMENT PRIMARY KEY"),
+            Column("card_id", "INT", RandInt(1, "cards"), "cards(card_id)"),
+            Column("amount", "DECIMAL(12,2)", RandInt(100, 10000)),
+            Column("txn_date", "DATETIME", DateTimeBack("-2y", 730)),
+            Column("merchant_name", "VARCHAR(100)", Fake("company")),
+            Column("city", "VARCHAR(50)", Choice(CITIES)),
+        ),
+    ),
+    Table(
+        "atm_locations",
+        (
+            Column("atm_id", "INT AUTO_INCREMENT PRIMARY KEY"),
+            Column("branch_id", "INT", RandInt(1, "branches"), "branches(branch_id)"),
+            Column("location", "VARCHAR(100)", Fake("street_address")),
+            Column("city", "VARCHAR(50)", Choice(CITIES)),
+            Column("status", "VARCHAR(20)", Choice(["Active", "Inactive"])),
+        ),
+    ),
+]
+
+SPECS: dict[str, Table] = {table.name: table for table in TABLES}
+# CREATE TABLE statements in creation order.
+SCHEMA: dict[str, str] = {table.name: compile_ddl(table) for table in TABLES}
+
+# Children first, so every FOREIGN KEY target still exists when dropped.
+DROP_ORDER = [
+    "card_transactions",
+    "cards",
+    "loan_payments",
+    "loans",
+    "transactions",
+    "accounts",
+    "customers",
+    "employees",
+    "atm_locations",
+    "branches",
+]
+
+
+def create_schema(
+    cur: mysql.connector.cursor.MySQLCursor,
+    deferred_constraints: bool = False,
+    partitions: dict[str, MonthlyPartitions] | None = None,
+) -> None:
+    """Recreate the tables; ``deferred_constraints`` leaves out the FOREIGN KEYs.
+
+    Deferred keys (and the indexes InnoDB creates for them) are added back by
+    :func:`restore_constraints` once the data is in. Tables in ``partitions``
+    are created partitioned by month, without foreign keys.
+    """
+    partitions = partitions or {}
+    for tbl in DROP_ORDER:
+        cur.execute(f"DROP TABLE IF EXISTS {tbl}")
+    for table in TABLES:
+        cur.execute(
+            compile_ddl(table, foreign_keys=not deferred_constraints, partitions=partitions.get(table.name))
+        )
+
+
+def foreign_keys(table: str) -> list[tuple[str, str, str]]:
+    """``(column, parent table, parent column)`` for each FOREIGN KEY, in DDL order."""
+    return SPECS[table].foreign_keys()
+
+
+def table_dependencies() -> dict[str, set[str]]:
+    """Map each table to the tables its FOREIGN KEYs reference."""
+    return {table: {parent for _, parent, _ in foreign_keys(table)} for table in SCHEMA}
+
+
+def apply_fast_load_session(cur: mysql.connector.cursor.MySQLCursor) -> None:
+    """Turn off per-row constraint checks and binary logging for this session."""
+    import mysql.connector
+
+    cur.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+    try:
+        cur.execute("SET SESSION sql_log_bin = 0")
+    except mysql.connector.Error:
+        pass  # needs SYSTEM_VARIABLES_ADMIN; the load still works with binlogging on
+
+
+def has_foreign_keys(cur: mysql.connector.cursor.MySQLCursor, table: str) -> bool:
+    # A resumed --fast-load run may have added some tables' keys before it stopped.
     cur.execute(
-        """
-        CREATE TABLE atm_locations (
-            atm_id INT AUTO_INCREMENT PRIMARY KEY,
-            branch_id INT,
-            location VARCHAR(100),
-            city VARCHAR(50),
-            status VARCHAR(20),
-            FOREIGN KEY (branch_id) REFERENCES branches(branch_id)
+        "SELECT COUNT(*) FROM information_schema.REFERENTIAL_CONSTRAINTS "
+        "WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,),
+    )
+    (count,) = cur.fetchone()
+    return count > 0
+
+
+def restore_constraints(cur: mysql.connector.cursor.MySQLCursor, partitioned: Iterable[str] = ()) -> None:
+    """Validate the loaded rows and add the FOREIGN KEYs left out by ``create_schema``.
+
+    Orphans are counted with one anti-join per key; the keys are then added
+    with checks off so InnoDB builds only the index instead of copying the
+    table. All keys of a table go into one ALTER in DDL order, so constraint
+    and index names match the inline definitions (``<table>_ibfk_<n>``).
+    ``partitioned`` tables cannot have foreign keys and are skipped.
+    """
+    cur.execute("SET SESSION foreign_key_checks = 0")
+    for table in SCHEMA:
+        keys = foreign_keys(table)
+        if not keys or table in partitioned or has_foreign_keys(cur, table):
+            continue
+        for column, parent, parent_column in keys:
+            cur.execute(
+                f"SELECT COUNT(*) FROM {table} c LEFT JOIN {parent} p ON c.{column} = p.{parent_column} "
+                f"WHERE c.{column} IS NOT NULL AND p.{parent_column} IS NULL"
+            )
+            (orphans,) = cur.fetchone()
+            if orphans:
+                raise SystemExit(f"{table}.{column}: {orphans} rows reference missing {parent} rows")
+        clauses = ", ".join(
+            f"ADD FOREIGN KEY ({column}) REFERENCES {parent}({parent_column})"
+            for column, parent, parent_column in keys
         )
-        """
+        cur.execute(f"ALTER TABLE {table} {clauses}")
+    cur.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+
+
+def primary_key(table: str) -> str:
+    return SPECS[table].primary_key
+
+
+class PooledFaker:
+    """Faker stand-in that samples pooled values for the expensive text providers.
+
+    Each pool holds up to ``pool_size`` unique values built once from a Faker
+    seeded with ``pool_seed``, so every process and thread sees identical pools
+    and tables share them (merchant companies, ATM street addresses, ...).
+    Rows only draw an index into the pool from the wrapped Faker's random
+    stream, turning O(rows) provider calls into O(pool size).
+    """
+
+    POOLED = ("name", "email", "phone_number", "company", "street_address", "sentence")
+
+    def __init__(self, fake: Faker, pool_size: int, pool_seed: int) -> None:
+        self._fake = fake
+        self._pool_size = pool_size
+        self._pool_seed = pool_seed
+        self._pools: dict[tuple, tuple[str, ...]] = {}
+
+    def __getattr__(self, name: str):
+        if name in self.POOLED:
+            return functools.partial(self._sample, name)
+        return getattr(self._fake, name)
+
+    def _pool(self, provider: str, kwargs: dict) -> tuple[str, ...]:
+        key = (provider, *sorted(kwargs.items()))
+        pool = self._pools.get(key)
+        if pool is None:
+            source = spec_faker("en_IN", TABLES)
+            source.seed_instance(f"{self._pool_seed}:{key}")
+            method = getattr(source, provider)
+            values = dict.fromkeys(method(**kwargs) for _ in range(self._pool_size * 2))
+            pool = self._pools[key] = tuple(values)[: self._pool_size]
+        return pool
+
+    def _sample(self, provider: str, **kwargs) -> str:
+        pool = self._pool(provider, kwargs)
+        return pool[self._fake.random.randrange(len(pool))]
+
+
+def new_faker(args: argparse.Namespace) -> Faker | PooledFaker:
+    fake = spec_faker("en_IN", TABLES)
+    if args.faker_pool_size > 0:
+        return PooledFaker(fake, args.faker_pool_size, args.seed)
+    return fake
+
+
+# Tables --partition-by-month partitions, with their date column.
+PARTITION_COLUMNS = {"transactions": "txn_date", "card_transactions": "txn_date"}
+
+# Batches queued per partition writer before the bucketing thread waits.
+PARTITION_QUEUE_DEPTH = 4
+
+
+def whole_seconds(value: datetime) -> datetime:
+    """``value`` rounded to whole seconds, as a MySQL DATETIME column stores it."""
+    if not value.microsecond:
+        return value
+    return (value + timedelta(microseconds=500_000)).replace(microsecond=0)
+
+
+def month_partitions() -> dict[str, MonthlyPartitions]:
+    """Monthly partitions over the date range each partitioned table's generator covers."""
+    today = date.today()
+    partitions = {}
+    for table, column in PARTITION_COLUMNS.items():
+        gen = next(spec.gen for spec in SPECS[table].columns if spec.name == column)
+        partitions[table] = MonthlyPartitions(column, today - timedelta(days=gen.days), today)
+    return partitions
+
+
+# Row-count option of each table, where it is not the table name.
+COUNT_ARGS = {"atm_locations": "atms"}
+
+# (table, insert columns, row-count argument, generation plan) in load order.
+TABLE_LOADS: list[tuple[str, tuple[str, ...], str, RowPlan]] = [
+    (table.name, table.insert_columns, COUNT_ARGS.get(table.name, table.name), RowPlan(table))
+    for table in TABLES
+]
+
+
+def counter_batch(
+    table: str,
+    make_batch: BatchFactory,
+    fake: Faker | PooledFaker,
+    rng: random.Random,
+    args: argparse.Namespace,
+    start: int,
+    stop: int,
+) -> list[tuple]:
+    """Rows ``[start, stop)`` of ``table`` as a pure function of seed, table and row number.
+
+    The incoming stream (``rng`` and Faker's state) is ignored, so batches,
+    shards and slices can be generated in any order or on their own.
+    """
+    if not isinstance(fake.random, CounterRandom):
+        target = fake._fake if isinstance(fake, PooledFaker) else fake
+        target.random = CounterRandom()
+    fake.random.seed(stream_key(args.seed, table, "faker"))
+    return make_batch(fake, CounterRandom(stream_key(args.seed, table, "rng")), args, start, stop)
+
+
+def offset_batch(
+    make_batch: BatchFactory,
+    offset: int,
+    fake: Faker | PooledFaker,
+    rng: random.Random,
+    args: argparse.Namespace,
+    start: int,
+    stop: int,
+) -> list[tuple]:
+    return make_batch(fake, rng, args, start + offset, stop + offset)
+
+
+def batch_factory(
+    table: str, plan: RowPlan, vectorized: bool, generator: str = "stream", offset: int = 0
+) -> BatchFactory:
+    """Fill whole columns with NumPy when enabled, else build rows one by one.
+
+    ``offset`` numbers the rows after that many rows already in the table.
+    """
+    make_batch = plan.columns if vectorized else plan.rows
+    if generator == "counter":
+        make_batch = functools.partial(counter_batch, table, make_batch)
+    if offset:
+        make_batch = functools.partial(offset_batch, make_batch, offset)
+    return make_batch
+
+
+def existing_rows(args: argparse.Namespace, table: str) -> int:
+    """Rows numbered before this run's: the table's highest id under ``--append``, else 0."""
+    return args.existing_ids.get(COUNT_ARGS.get(table, table), 0)
+
+
+def table_slice(
+    args: argparse.Namespace, table: str, start: int, stop: int, fake: Faker | PooledFaker | None = None
+) -> list[tuple]:
+    """Rows ``[start, stop)`` of ``table`` under ``--generator counter``, without the rows before them."""
+    _, _, _, plan = next(load for load in TABLE_LOADS if load[0] == table)
+    make_batch = batch_factory(table, plan, args.vectorized, "counter")
+    return make_batch(fake or new_faker(args), None, args, start, stop)
+
+
+def generate_batches(
+    fake: Faker,
+    rng: random.Random,
+    args: argparse.Namespace,
+    make_batch: BatchFactory,
+    count: int,
+    batch_size: int,
+    first_row: int = 0,
+) -> Iterator[list[tuple]]:
+    """Yield rows ``[first_row, count)`` in lists of at most ``batch_size``.
+
+    Only one batch is alive at a time, so memory stays flat regardless of the
+    table size while the random stream is consumed in exactly the same order
+    as building the whole table up front.
+    """
+    for start in range(first_row, count, batch_size):
+        yield make_batch(fake, rng, args, start, min(start + batch_size, count))
+
+
+def shard_seed(seed: int, table: str, shard: int) -> int:
+    """Derive a stable per-shard seed (``hash()`` is salted per process)."""
+    digest = hashlib.sha256(f"{seed}:{table}:{shard}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+_worker_fake: Faker | PooledFaker | None = None
+
+
+def init_worker(args: argparse.Namespace) -> None:
+    global _worker_fake
+    _worker_fake = new_faker(args)
+
+
+def shard_rows(
+    fake: Faker, make_batch: BatchFactory, args: argparse.Namespace, seed: int, start: int, stop: int
+) -> list[tuple]:
+    """Generate rows ``[start, stop)`` from an independent per-shard seed."""
+    fake.seed_instance(seed)
+    return make_batch(fake, random.Random(seed), args, start, stop)
+
+
+def generate_shard(
+    make_batch: BatchFactory, args: argparse.Namespace, seed: int, start: int, stop: int
+) -> list[tuple]:
+    return shard_rows(_worker_fake, make_batch, args, seed, start, stop)
+
+
+def shard_bounds(count: int, shards: range) -> Iterator[tuple[int, int, int]]:
+    for shard in shards:
+        start = shard * SHARD_ROWS
+        yield shard, start, min(start + SHARD_ROWS, count)
+
+
+def generate_batches_sharded(
+    fake: Faker,
+    args: argparse.Namespace,
+    table: str,
+    make_batch: BatchFactory,
+    count: int,
+    batch_size: int,
+    shards: range,
+) -> Iterator[list[tuple]]:
+    """In-process counterpart of :func:`generate_batches_parallel` (same rows)."""
+    for shard, start, stop in shard_bounds(count, shards):
+        rows = shard_rows(fake, make_batch, args, shard_seed(args.stream_seed, table, shard), start, stop)
+        for i in range(0, len(rows), batch_size):
+            yield rows[i : i + batch_size]
+
+
+def generate_batches_parallel(
+    executor: ProcessPoolExecutor,
+    workers: int,
+    args: argparse.Namespace,
+    table: str,
+    make_batch: BatchFactory,
+    count: int,
+    batch_size: int,
+    shards: range,
+) -> Iterator[list[tuple]]:
+    """Yield batches from shards generated across the process pool, in row order.
+
+    At most ``2 * workers`` shards are in flight, which keeps memory bounded
+    while the pool stays busy.
+    """
+    todo = shard_bounds(count, shards)
+    pending: deque[Future] = deque()
+
+    def submit_next() -> None:
+        for shard, start, stop in todo:
+            seed = shard_seed(args.stream_seed, table, shard)
+            pending.append(executor.submit(generate_shard, make_batch, args, seed, start, stop))
+            return
+
+    for _ in range(2 * workers):
+        submit_next()
+    while pending:
+        rows = pending.popleft().result()
+        submit_next()
+        for i in range(0, len(rows), batch_size):
+            yield rows[i : i + batch_size]
+
+
+def shard_count(count: int) -> int:
+    return (count + SHARD_ROWS - 1) // SHARD_ROWS
+
+
+def count_batches(count: int, batch_size: int, shards: range | None = None) -> int:
+    """Number of batches for a sequential table (``shards=None``) or a shard range."""
+    if shards is None:
+        return (count + batch_size - 1) // batch_size
+    return sum(
+        (stop - start + batch_size - 1) // batch_size for _, start, stop in shard_bounds(count, shards)
     )
 
 
+def split_shards(count: int, parts: int) -> list[range]:
+    """Split a table's shards into at most ``parts`` contiguous, non-empty ranges."""
+    total = shard_count(count)
+    parts = max(1, min(parts, total))
+    bounds = [total * p // parts for p in range(parts + 1)]
+    return [range(lo, hi) for lo, hi in zip(bounds, bounds[1:])]
+
+
+def resume_shards(shards: range, first_row: int) -> tuple[range, int]:
+    """Shards left once rows before ``first_row`` are in, and how many rows of the first to drop.
+
+    Shards are seeded independently, so a partly loaded shard is regenerated
+    (at most ``SHARD_ROWS`` rows) and its committed prefix skipped.
+    """
+    shard = max(shards.start, first_row // SHARD_ROWS)
+    return range(shard, shards.stop), max(0, first_row - shard * SHARD_ROWS)
+
+
+def skip_rows(batches: Iterable[list[tuple]], rows: int) -> Iterator[list[tuple]]:
+    for batch in batches:
+        if rows >= len(batch):
+            rows -= len(batch)
+            continue
+        yield batch[rows:]
+        rows = 0
+
+
+def with_ids(batches: Iterable[list[tuple]], first_id: int) -> Iterator[list[tuple]]:
+    """Prefix explicit primary keys so concurrent parts keep deterministic ids."""
+    next_id = first_id
+    for batch in batches:
+        yield [(next_id + offset, *row) for offset, row in enumerate(batch)]
+        next_id += len(batch)
+
+
+class PreparedInsert:
+    """Multi-row INSERT prepared once per table and executed over the binary protocol.
+
+    Parameters travel as typed binary values, so there is no client-side
+    escaping or statement text to rebuild per batch. Full batches reuse one
+    prepared shape; a short final batch gets a second cursor.
+    """
+
+    def __init__(self, conn: mysql.connector.MySQLConnection, table: str, columns: tuple[str, ...]) -> None:
+        self.conn = conn
+        self.table = table
+        self.columns = columns
+        self.rows_per_statement = 0
+        # Statement of a full batch, set with ``rows_per_statement`` on the first call.
+        self.full_sql: str | None = None
+        self.cursors: dict[bool, mysql.connector.cursor.MySQLCursorPrepared] = {}
+
+    def statement(self, rows: int) -> str:
+        group = "(" + ",".join(["%s"] * len(self.columns)) + ")"
+        return f"INSERT INTO {self.table} ({', '.join(self.columns)}) VALUES " + ",".join([group] * rows)
+
+    def __call__(self, batch: list[tuple]) -> None:
+        if not self.rows_per_statement:
+            # The shape follows the first batch, capped by the 16-bit placeholder count.
+            self.rows_per_statement = max(1, min(len(batch), MAX_PLACEHOLDERS // len(self.columns)))
+            self.full_sql = self.statement(self.rows_per_statement)
+        for start in range(0, len(batch), self.rows_per_statement):
+            chunk = batch[start : start + self.rows_per_statement]
+            full = len(chunk) == self.rows_per_statement
+            if full not in self.cursors:
+                self.cursors[full] = self.conn.cursor(prepared=True)
+            sql = self.full_sql if full else self.statement(len(chunk))
+            self.cursors[full].execute(sql, [value for row in chunk for value in row])
+
+    def close(self) -> None:
+        for cur in self.cursors.values():
+            cur.close()
+
+
+def prepared_bytes(batch: list[tuple]) -> int:
+    """Approximate binary-protocol size of ``batch``'s parameters, as ``PreparedInsert`` sends them.
+
+    Two type bytes and a NULL-bitmap bit per parameter; 8 bytes per number,
+    5 per date and 12 per datetime; text (DECIMAL included) with a 1-byte
+    length prefix. Statement ids and packet headers are left out.
+    """
+    values = [value for row in batch for value in row]
+    size = 2 * len(values) + (len(values) + 7) // 8
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, (int, float)):
+            size += 8
+        elif isinstance(value, datetime):
+            size += 12
+        elif isinstance(value, date):
+            size += 5
+        else:
+            size += len(str(value).encode()) + 1
+    return size
+
+
+def pick_strategy(trial: dict[str, list]) -> tuple[str, dict[str, float]]:
+    rates = {name: rows / seconds for name, (rows, seconds) in trial.items() if seconds}
+    return (max(rates, key=rates.get) if rates else "executemany"), rates
+
+
 def insert_batched(
     conn: mysql.connector.MySQLConnection,
     cur: mysql.connector.cursor.MySQLCursor,
-    sql: str,
-    rows: list[tuple],
-    batch_size: int,
+    table: str,
+    columns: tuple[str, ...],
+    batches: Iterable[list[tuple]],
+    total_batches: int,
     desc: str,
+    stats: TableStats,
+    strategy: str = "executemany",
+    batcher: AdaptiveBatcher | None = None,
+    on_commit: Callable[[int], None] | None = None,
 ) -> None:
-    total_batches = (len(rows) + batch_size - 1) // batch_size
-    for batch in tqdm(chunks(rows, batch_size), total=total_batches, desc=desc):
-        cur.executemany(sql, batch)
-        conn.commit()
+    """INSERT and commit batch by batch with ``executemany``, ``prepared`` or ``auto``.
 
+    ``auto`` alternates the two for the first batches of the table and keeps
+    the one with the higher execute+commit rows/s for the rest.
+    """
+    sql = insert_sql(table, columns)
+    prepared = PreparedInsert(conn, table, columns)
+    inserters: dict[str, Callable[[list[tuple]], None]] = {
+        "executemany": lambda batch: cur.executemany(sql, batch),
+        "prepared": prepared,
+    }
+    trial: dict[str, list] = {"executemany": [0, 0.0], "prepared": [0, 0.0]}
+    choice = None if strategy == "auto" else strategy
+    batches = progress(batches, total=total_batches, desc=desc)
+    if batcher is not None:
+        batches = batcher.rebatch(batches)
+    try:
+        for index, (batch, generate) in enumerate(stats.timed(batches)):
+            name = choice or AUTO_TRIAL_ORDER[index % 2]
+            began = time.perf_counter()
+            inserters[name](batch)
+            executed = time.perf_counter()
+            conn.commit()
+            committed = time.perf_counter()
+            nbytes = statement_bytes(cur) if name == "executemany" else prepared_bytes(batch)
+            stats.record(
+                len(batch),
+                generate=generate,
+                execute=executed - began,
+                commit=committed - executed,
+                nbytes=nbytes,
+            )
+            if on_commit is not None:
+                on_commit(len(batch))
+            if batcher is not None:
+                batcher.observe(len(batch), committed - began, nbytes)
+            if choice is None:
+                if index >= len(AUTO_TRIAL_ORDER):  # first batch of each is a warm-up
+                    trial[name][0] += len(batch)
+                    trial[name][1] += committed - began
+                if index + 1 == len(AUTO_TRIAL_ORDER) * (AUTO_TRIAL_BATCHES + 1):
+                    choice, _ = pick_strategy(trial)
+    finally:
+        prepared.close()
+    if strategy == "auto":
+        chosen, rates = pick_strategy(trial)
+        stats.note(
+            "strategy",
+            {"chosen": choice or chosen, "rows_per_s": {name: round(rate, 1) for name, rate in rates.items()}},
+        )
+    if batcher is not None:
+        stats.note("adaptive_batch", batcher.summary())
 
-def main() -> None:
-    args = parse_args()
-    random.seed(args.seed)
-    Faker.seed(args.seed)
-    fake = Faker("en_IN")
 
-    conn = mysql.connector.connect(host=args.host, user=args.user, password=args.password)
-    cur = conn.cursor()
+def load_data_sql(path: str, table: str, columns: tuple[str, ...]) -> str:
+    # Forward slashes keep Windows temp paths valid inside the SQL literal.
+    path = path.replace("\\", "/").replace("'", "\\'")
+    column_list = f" ({', '.join(columns)})" if columns else ""
+    return (
+        f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table} "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+        f"LINES TERMINATED BY '\\n'{column_list}"
+    )
 
-    cities = [
-        "Pune",
-        "Mumbai",
-        "Nagpur",
-        "Nashik",
-        "Aurangabad",
-        "Kolhapur",
-        "Solapur",
-        "Thane",
-        "Ahmednagar",
-        "Satara",
-    ]
 
+def local_infile_supported(cur: mysql.connector.cursor.MySQLCursor, table: str) -> bool:
+    """Probe LOAD DATA LOCAL INFILE with an empty file; nothing is loaded."""
+    import mysql.connector
+
+    fd, path = tempfile.mkstemp(suffix=".tsv")
+    os.close(fd)
     try:
-        cur.execute(f"CREATE DATABASE IF NOT EXISTS {args.database}")
-        cur.execute(f"USE {args.database}")
-        create_schema(cur)
+        cur.execute(load_data_sql(path, table, ()))
+        return True
+    except mysql.connector.Error as exc:
+        if exc.errno in LOCAL_INFILE_ERRNOS:
+            return False
+        raise
+    finally:
+        os.remove(path)
+
+
+def load_data_batched(
+    conn: mysql.connector.MySQLConnection,
+    cur: mysql.connector.cursor.MySQLCursor,
+    table: str,
+    columns: tuple[str, ...],
+    batches: Iterable[list[tuple]],
+    total_batches: int,
+    desc: str,
+    stats: TableStats,
+    on_commit: Callable[[int], None] | None = None,
+) -> None:
+    """Stream batches into a temporary TSV file and ingest it with LOAD DATA.
+
+    The file is loaded and truncated every ``LOAD_DATA_CHUNK_ROWS`` rows, so
+    both memory and temporary disk usage stay bounded.
+    """
+    fd, path = tempfile.mkstemp(prefix=f"{table}_", suffix=".tsv")
+    os.close(fd)
+    sql = load_data_sql(path, table, columns)
+
+    def flush(handle, rows: int) -> None:
+        handle.close()
+        began = time.perf_counter()
+        cur.execute(sql)
+        executed = time.perf_counter()
         conn.commit()
+        stats.record(0, execute=executed - began, commit=time.perf_counter() - executed)
+        if on_commit is not None:
+            on_commit(rows)
 
-        branch_rows = [
-            (
-                f"{random.choice(cities)} Branch {i + 1}",
-                f"BR{i + 1:03d}",
-                random.choice(cities),
-                f"MAHB{i + 1:07d}",
+    try:
+        handle = open(path, "wb")
+        pending = 0
+        for batch, generate in progress(stats.timed(batches), total=total_batches, desc=desc):
+            began = time.perf_counter()
+            encoded = "".join(tsv_line(row) for row in batch).encode()
+            handle.write(encoded)
+            stats.record(
+                len(batch),
+                generate=generate,
+                serialize=time.perf_counter() - began,
+                nbytes=len(encoded),
             )
-            for i in range(args.branches)
-        ]
-        insert_batched(
-            conn,
-            cur,
-            "INSERT INTO branches (branch_name, branch_code, city, ifsc_code) VALUES (%s,%s,%s,%s)",
-            branch_rows,
-            args.batch_size,
-            "branches",
-        )
+            pending += len(batch)
+            if pending >= LOAD_DATA_CHUNK_ROWS:
+                flush(handle, pending)
+                handle = open(path, "wb")
+                pending = 0
+        if pending:
+            flush(handle, pending)
+        else:
+            handle.close()
+    finally:
+        os.remove(path)
 
-        employee_rows = [
-            (
-                fake.name(),
-                random.choice(["Manager", "Clerk", "Cashier", "Officer"]),
-                random.randint(1, args.branches),
-                random.randint(30000, 90000),
-                fake.date_between(start_date="-5y", end_date="today"),
-            )
-            for _ in range(args.employees)
-        ]
-        insert_batched(
-            conn,
-            cur,
-            "INSERT INTO employees (emp_name, designation, branch_id, salary, doj) VALUES (%s,%s,%s,%s,%s)",
-            employee_rows,
-            args.batch_size,
-            "employees",
-        )
 
-        customer_rows = [
-            (
-                fake.name(),
-                fake.date_of_birth(minimum_age=18, maximum_age=75),
-                random.choice(["Male", "Female"]),
-                random.choice(cities),
-                fake.phone_number(),
-                fake.email(),
-            )
-            for _ in range(args.customers)
-        ]
-        insert_batched(
-            conn,
-            cur,
-            "INSERT INTO customers (full_name, dob, gender, city, contact_no, email) VALUES (%s,%s,%s,%s,%s,%s)",
-            customer_rows,
-            args.batch_size,
-            "customers",
-        )
+def table_parts(args: argparse.Namespace, table: str, count: int) -> list[range]:
+    """Shard ranges loaded as separate parts (one unless the table is ``--split``)."""
+    return split_shards(count, args.splits.get(table, 1)) if count else []
 
-        account_rows = [
-            (
-                random.randint(1, args.customers),
-                random.randint(1, args.branches),
-                random.choice(["Saving", "Current"]),
-                random.randint(1000, 100000),
-                fake.date_between(start_date="-5y", end_date="today"),
-            )
-            for _ in range(args.accounts)
-        ]
+
+def adaptive_start(args: argparse.Namespace) -> int | None:
+    return args.batch_size if args.adaptive_batch else None
+
+
+def pipelined(
+    args: argparse.Namespace, batches: Iterable[list[tuple]], total_batches: int, desc: str
+) -> Iterable[list[tuple]]:
+    """``batches`` through a producer thread under ``--pipeline``, else unchanged."""
+    if not args.pipeline:
+        return batches
+    return prefetch(batches, args.pipeline, total_batches, desc)
+
+
+def load_batches(
+    conn: mysql.connector.MySQLConnection,
+    cur: mysql.connector.cursor.MySQLCursor,
+    table: str,
+    columns: tuple[str, ...],
+    batches: Iterable[list[tuple]],
+    total_batches: int,
+    desc: str,
+    strategy: str,
+    stats: TableStats,
+    adaptive_start: int | None = None,
+    progress: PartProgress | None = None,
+    pipeline_depth: int = 0,
+) -> None:
+    """Load one table's batches.
+
+    ``adaptive_start`` turns on adaptive INSERT batch sizes; ``progress``
+    journals every commit for ``--resume``; ``pipeline_depth`` generates
+    batches on a producer thread that many batches ahead of the inserts.
+    """
+    on_commit = None
+    if progress is not None:
+        # Tracked on the producer side, so saved generator states match the batch boundaries.
+        batches = progress.track(batches)
+        on_commit = progress.committed
+    if pipeline_depth:
+        batches = prefetch(batches, pipeline_depth, total_batches, desc)
+    if strategy == "load-data":
+        load_data_batched(conn, cur, table, columns, batches, total_batches, desc, stats, on_commit)
+    else:
+        batcher = AdaptiveBatcher.for_cursor(cur, adaptive_start) if adaptive_start else None
         insert_batched(
-            conn,
-            cur,
-            "INSERT INTO accounts (customer_id, branch_id, account_type, balance, opening_date) VALUES (%s,%s,%s,%s,%s)",
-            account_rows,
-            args.batch_size,
-            "accounts",
+            conn, cur, table, columns, batches, total_batches, desc, stats, strategy, batcher, on_commit
         )
+    if progress is not None:
+        progress.finish()
 
-        transaction_rows = [
-            (
-                random.randint(1, args.accounts),
-                random.choice(["Credit", "Debit"]),
-                random.randint(100, 50000),
-                fake.date_time_between(start_date="-2y", end_date="now"),
-                fake.sentence(nb_words=6),
+
+def load_part(
+    pool: mysql.connector.pooling.MySQLConnectionPool,
+    args: argparse.Namespace,
+    executor: ProcessPoolExecutor | None,
+    strategy: str,
+    table: str,
+    columns: tuple[str, ...],
+    make_batch: BatchFactory,
+    count: int,
+    shards: range,
+    desc: str,
+    explicit_ids: bool,
+    stats: TableStats,
+    journal: LoadJournal | None,
+    checksums: ChecksumManifest | None = None,
+) -> None:
+    """Load one shard range of a table on its own pooled connection."""
+    conn = pool.get_connection()
+    cur = conn.cursor()
+    try:
+        if args.fast_load:
+            apply_fast_load_session(cur)
+        part_start = shards.start * SHARD_ROWS
+        committed = journal.rows(table, part_start) if journal else 0
+        progress = PartProgress(journal, table, part_start, committed) if journal else None
+        shards, skip = resume_shards(shards, part_start + committed)
+        if executor is not None:
+            batches = generate_batches_parallel(
+                executor, args.workers, args, table, make_batch, count, args.batch_size, shards
             )
-            for _ in range(args.transactions)
-        ]
-        insert_batched(
+        else:
+            batches = generate_batches_sharded(
+                new_faker(args), args, table, make_batch, count, args.batch_size, shards
+            )
+        batches = skip_rows(batches, skip)
+        if checksums is not None:
+            batches = checksums.track(table, batches, existing_rows(args, table) + part_start + committed + 1)
+        if explicit_ids:
+            columns = (primary_key(table), *columns)
+            batches = with_ids(batches, existing_rows(args, table) + part_start + committed + 1)
+        total_batches = count_batches(count, args.batch_size, shards)
+        load_batches(
             conn,
             cur,
-            "INSERT INTO transactions (account_id, txn_type, amount, txn_date, description) VALUES (%s,%s,%s,%s,%s)",
-            transaction_rows,
-            args.batch_size,
-            "transactions",
+            table,
+            columns,
+            batches,
+            total_batches,
+            desc,
+            strategy,
+            stats,
+            adaptive_start(args),
+            progress,
+            args.pipeline,
         )
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
 
-        loan_rows = [
-            (
-                random.randint(1, args.customers),
-                random.randint(1, args.branches),
-                random.choice(["Home Loan", "Personal Loan", "Car Loan", "Education Loan"]),
-                random.randint(100000, 2000000),
-                random.uniform(6.5, 12.5),
-                fake.date_between(start_date="-5y", end_date="today"),
-            )
-            for _ in range(args.loans)
-        ]
-        insert_batched(
-            conn,
-            cur,
-            "INSERT INTO loans (customer_id, branch_id, loan_type, loan_amount, interest_rate, start_date) VALUES (%s,%s,%s,%s,%s,%s)",
-            loan_rows,
-            args.batch_size,
-            "loans",
+
+def load_tables_parallel(
+    pool: mysql.connector.pooling.MySQLConnectionPool,
+    args: argparse.Namespace,
+    executor: ProcessPoolExecutor | None,
+    strategy: str,
+    metrics: LoadMetrics,
+    journal: LoadJournal | None = None,
+    checksums: ChecksumManifest | None = None,
+) -> None:
+    """Load tables as soon as every table they reference is complete.
+
+    Independent tables (and the parts of a ``--split`` table) run concurrently,
+    one pooled connection each, so the total time follows the critical path of
+    the foreign-key graph instead of the sum of all tables.
+    """
+    dependencies = table_dependencies()
+    done: set[str] = set()
+    outstanding: dict[str, int] = {}
+    running: dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=args.connections) as threads:
+
+        def start_ready() -> None:
+            progress = True
+            while progress:
+                progress = False
+                for table, columns, count_arg, plan in TABLE_LOADS:
+                    # Partitioned tables are leaves, loaded once the graph is done.
+                    if table in outstanding or table in args.partitions or not dependencies[table] <= done:
+                        continue
+                    count = getattr(args, count_arg)
+                    parts = table_parts(args, table, count)
+                    todo = [
+                        (part, shards)
+                        for part, shards in enumerate(parts)
+                        if not (journal and journal.done(table, shards.start * SHARD_ROWS))
+                    ]
+                    outstanding[table] = len(todo)
+                    if not todo:
+                        done.add(table)
+                        progress = True
+                    for part, shards in todo:
+                        desc = f"{table}[{part + 1}/{len(parts)}]" if len(parts) > 1 else table
+                        future = threads.submit(
+                            load_part,
+                            pool,
+                            args,
+                            executor,
+                            strategy,
+                            table,
+                            columns,
+                            batch_factory(
+                                table, plan, args.vectorized, args.generator, existing_rows(args, table)
+                            ),
+                            count,
+                            shards,
+                            desc,
+                            len(parts) > 1,
+                            metrics.table(table),
+                            journal,
+                            checksums,
+                        )
+                        running[future] = table
+
+        start_ready()
+        try:
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    table = running.pop(future)
+                    future.result()
+                    outstanding[table] -= 1
+                    if outstanding[table] == 0:
+                        done.add(table)
+                start_ready()
+        except BaseException:
+            threads.shutdown(cancel_futures=True)
+            raise
+
+
+def table_batches(
+    args: argparse.Namespace,
+    fake: Faker | PooledFaker,
+    rng: random.Random,
+    executor: ProcessPoolExecutor | None,
+    table: str,
+    plan: RowPlan,
+    count: int,
+    first_row: int = 0,
+) -> tuple[Iterator[list[tuple]], int]:
+    """Batches of a table from ``first_row`` on for a single-connection run, and their count."""
+    make_batch = batch_factory(table, plan, args.vectorized, args.generator, existing_rows(args, table))
+    if executor is not None:
+        shards, skip = resume_shards(range(shard_count(count)), first_row)
+        batches = generate_batches_parallel(
+            executor, args.workers, args, table, make_batch, count, args.batch_size, shards
         )
+        return skip_rows(batches, skip), count_batches(count, args.batch_size, shards)
+    batches = generate_batches(fake, rng, args, make_batch, count, args.batch_size, first_row)
+    return batches, count_batches(count - first_row, args.batch_size)
+
+
+def all_batches(
+    args: argparse.Namespace,
+    fake: Faker | PooledFaker,
+    rng: random.Random,
+    executor: ProcessPoolExecutor | None,
+    table: str,
+    plan: RowPlan,
+    count: int,
+) -> Iterator[list[tuple]]:
+    """Every batch of a table as a load with these options generates it, whatever the connections."""
+    if executor is None and args.connections > 1:
+        # The shard seeds the table's parts get in a --connections load.
+        make_batch = batch_factory(table, plan, args.vectorized, args.generator, existing_rows(args, table))
+        shards = range(shard_count(count))
+        return generate_batches_sharded(new_faker(args), args, table, make_batch, count, args.batch_size, shards)
+    batches, _ = table_batches(args, fake, rng, executor, table, plan, count)
+    return batches
+
+
+def partition_writer(
+    args: argparse.Namespace,
+    table: str,
+    columns: tuple[str, ...],
+    names: list[str],
+    inbox: queue.Queue,
+    stats: TableStats,
+    failed: threading.Event,
+) -> None:
+    """Insert ``(partition, rows)`` batches from ``inbox`` on a connection of its own until ``None``."""
+    import mysql.connector
 
-        loan_payment_rows = [
-            (
-                random.randint(1, args.loans),
-                fake.date_between(start_date="-3y", end_date="today"),
-                random.randint(2000, 50000),
+    conn = mysql.connector.connect(
+        host=args.host, user=args.user, password=args.password, database=args.database
+    )
+    cur = conn.cursor()
+    # Naming the partition makes MySQL lock and check only that partition.
+    sql = {name: insert_sql(f"{table} PARTITION ({name})", columns) for name in names}
+    try:
+        if args.fast_load:
+            apply_fast_load_session(cur)
+        while (item := inbox.get()) is not None and not failed.is_set():
+            name, batch = item
+            began = time.perf_counter()
+            cur.executemany(sql[name], batch)
+            executed = time.perf_counter()
+            conn.commit()
+            stats.record(
+                len(batch),
+                execute=executed - began,
+                commit=time.perf_counter() - executed,
+                nbytes=statement_bytes(cur),
             )
-            for _ in range(args.loan_payments)
+    except BaseException:
+        failed.set()
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+
+def load_partitioned(
+    args: argparse.Namespace,
+    fake: Faker | PooledFaker,
+    rng: random.Random,
+    executor: ProcessPoolExecutor | None,
+    table: str,
+    columns: tuple[str, ...],
+    plan: RowPlan,
+    count: int,
+    stats: TableStats,
+    checksums: ChecksumManifest | None = None,
+) -> None:
+    """Load a ``--partition-by-month`` table partition-parallel over ``--connections`` connections.
+
+    Rows are generated in order as usual and given explicit ids, so the
+    result does not depend on how the writers interleave. They are then
+    bucketed by month. Each full bucket goes to the writer owning that
+    partition, and each writer owns every ``--connections``-th partition.
+    Partitions are therefore filled in parallel, one connection each.
+    """
+    partitions = args.partitions[table]
+    batches = all_batches(args, fake, rng, executor, table, plan, count)
+    if checksums is not None:
+        batches = checksums.track(table, batches, existing_rows(args, table) + 1)
+    batches = pipelined(args, batches, count_batches(count, args.batch_size), table)
+    batches = with_ids(batches, existing_rows(args, table) + 1)
+    columns = (primary_key(table), *columns)
+    position = columns.index(partitions.column)
+    names = partitions.names
+    writers = args.connections
+    inboxes = [queue.Queue(maxsize=PARTITION_QUEUE_DEPTH) for _ in range(writers)]
+    failed = threading.Event()
+
+    def send(index: int, rows: list[tuple]) -> None:
+        inbox = inboxes[index % writers]
+        while not failed.is_set():
+            try:
+                inbox.put((names[index], rows), timeout=PUT_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    with ThreadPoolExecutor(max_workers=writers) as threads:
+        futures = [
+            threads.submit(partition_writer, args, table, columns, names, inbox, stats, failed)
+            for inbox in inboxes
         ]
-        insert_batched(
-            conn,
-            cur,
-            "INSERT INTO loan_payments (loan_id, payment_date, payment_amount) VALUES (%s,%s,%s)",
-            loan_payment_rows,
-            args.batch_size,
-            "loan_payments",
-        )
+        try:
+            buckets: list[list[tuple]] = [[] for _ in names]
+            with progress(total=count, unit="row", desc=f"{table} by month") as bar:
+                for batch in batches:
+                    if failed.is_set():
+                        break
+                    for row in batch:
+                        value = row[position]
+                        if isinstance(value, datetime) and value.microsecond:
+                            # Partition by the stored value: the server rounds to whole seconds,
+                            # and a row rounded into the next month fails an explicit PARTITION.
+                            value = whole_seconds(value)
+                            row = (*row[:position], value, *row[position + 1 :])
+                        index = partitions.index(value)
+                        bucket = buckets[index]
+                        bucket.append(row)
+                        if len(bucket) >= args.batch_size:
+                            send(index, bucket)
+                            buckets[index] = []
+                    bar.update(len(batch))
+            for index, bucket in enumerate(buckets):
+                if bucket:
+                    send(index, bucket)
+        except BaseException:
+            failed.set()
+            raise
+        finally:
+            for inbox, future in zip(inboxes, futures):
+                while not future.done():
+                    try:
+                        inbox.put(None, timeout=PUT_POLL_SECONDS)
+                        break
+                    except queue.Full:
+                        continue
+        for future in futures:
+            future.result()
+
+
+def export_dataset(
+    args: argparse.Namespace,
+    fake: Faker | PooledFaker,
+    rng: random.Random,
+    executor: ProcessPoolExecutor | None,
+) -> None:
+    """Write the schema and every table to ``--output-dir`` without touching MySQL."""
+    writer = DatasetWriter(
+        args.output_dir,
+        args.database,
+        args.export_format,
+        args.compression,
+        args.chunk_mb * 1024 * 1024,
+    )
+    recorder = SchemaRecorder()
+    create_schema(recorder, partitions=args.partitions)
+    writer.write_schema(recorder.statements)
+    for table, columns, count_arg, plan in TABLE_LOADS:
+        count = getattr(args, count_arg)
+        batches, total_batches = table_batches(args, fake, rng, executor, table, plan, count)
+        batches = pipelined(args, batches, total_batches, table)
+        writer.write_table(table, primary_key(table), columns, progress(batches, total=total_batches, desc=table))
+    writer.close()
+    print(f"\n✅ Dataset written to {args.output_dir}")
 
-        card_rows = [
-            (
-                random.randint(1, args.customers),
-                random.choice(["Debit", "Credit"]),
-                fake.credit_card_number(card_type=None),
-                fake.date_between(start_date="today", end_date="+5y"),
-                str(random.randint(100, 999)),
+
+def load_backend(
+    args: argparse.Namespace,
+    fake: Faker | PooledFaker,
+    rng: random.Random,
+    executor: ProcessPoolExecutor | None,
+    metrics: LoadMetrics,
+    checksums: ChecksumManifest | None = None,
+) -> None:
+    """Load through one of the non-MySQL backends in ``db_backends``, table by table."""
+    backend = get_backend(args.backend)
+    conn = backend.connect(args)
+    cur = conn.cursor()
+    try:
+        backend.use_database(cur, args.database)
+        if args.append:
+            prepare_append(backend, cur, args, fake, rng)
+        else:
+            recorder = SchemaRecorder()
+            create_schema(recorder)
+            backend.create_schema(cur, recorder.statements)
+        conn.commit()
+
+        for table, columns, count_arg, plan in TABLE_LOADS:
+            count = getattr(args, count_arg)
+            batches, total_batches = table_batches(args, fake, rng, executor, table, plan, count)
+            if checksums is not None:
+                batches = checksums.track(table, batches, 1)
+            batches = pipelined(args, batches, total_batches, table)
+            backend.bulk_insert(
+                conn, cur, table, columns, progress(batches, total=total_batches, desc=table), metrics.table(table)
             )
-            for _ in range(args.cards)
-        ]
-        insert_batched(
-            conn,
-            cur,
-            "INSERT INTO cards (customer_id, card_type, card_number, expiry_date, cvv) VALUES (%s,%s,%s,%s,%s)",
-            card_rows,
-            args.batch_size,
-            "cards",
-        )
 
-        card_txn_rows = [
-            (
-                random.randint(1, args.cards),
-                random.randint(100, 10000),
-                fake.date_time_between(start_date="-2y", end_date="now"),
-                fake.company(),
-                random.choice(cities),
+        print(f"\n✅ All tables populated successfully ({backend.name})!")
+    except backend.errors as exc:
+        conn.rollback()
+        raise SystemExit(f"Database error: {exc}") from exc
+    finally:
+        cur.close()
+        conn.close()
+
+
+def prepare_append(
+    backend: MySQLBackend,
+    cur,
+    args: argparse.Namespace,
+    fake: Faker | PooledFaker,
+    rng: random.Random,
+) -> None:
+    """Continue every table after its existing rows for ``--append``.
+
+    Each table's highest id goes into ``args.existing_ids``: new rows are
+    numbered after it (ids, unique values, ``{n}`` templates) and foreign
+    keys draw from the old and new parent ids. The random streams move to a
+    seed derived from those ids, so the new rows do not replay the old ones.
+    """
+    parents = {parent for table in SCHEMA for _, parent, _ in foreign_keys(table)}
+    for table, _, count_arg, _ in TABLE_LOADS:
+        pk = primary_key(table)
+        rows, max_id = backend.table_extent(cur, table, pk)
+        if table in parents and rows != max_id:
+            raise SystemExit(
+                f"{table} has {rows:,} rows but ids up to {max_id:,}; --append draws foreign keys "
+                "from every id up to the highest and needs them contiguous"
             )
-            for _ in range(args.card_transactions)
-        ]
-        insert_batched(
-            conn,
-            cur,
-            "INSERT INTO card_transactions (card_id, amount, txn_date, merchant_name, city) VALUES (%s,%s,%s,%s,%s)",
-            card_txn_rows,
-            args.batch_size,
-            "card_transactions",
+        backend.continue_ids(cur, table, pk, max_id)
+        args.existing_ids[count_arg] = max_id
+        print(f"{table}: {rows:,} existing rows, appending {getattr(args, count_arg):,}")
+    if any(args.existing_ids.values()):
+        args.stream_seed = stream_key(args.seed, "append", *args.existing_ids.values())
+        rng.seed(args.stream_seed)
+        fake.seed_instance(args.stream_seed)
+
+
+def journal_fingerprint(args: argparse.Namespace) -> dict:
+    """Options that decide which rows a load produces and where they go."""
+    fingerprint = {
+        name: getattr(args, name)
+        for name in (
+            "database",
+            "seed",
+            "batch_size",
+            "vectorized",
+            "faker_pool_size",
+            "generator",
+            "fast_load",
+            "splits",
         )
+    }
+    fingerprint["counts"] = [getattr(args, count_arg) for _, _, count_arg, _ in TABLE_LOADS]
+    fingerprint["sharded"] = args.workers > 1 or args.connections > 1
+    return fingerprint
+
+
+def generator_state(fake: Faker | PooledFaker, rng: random.Random) -> list:
+    return [rng.getstate(), fake.random.getstate()]
+
+
+def set_generator_state(fake: Faker | PooledFaker, rng: random.Random, state: tuple) -> None:
+    rng.setstate(state[0])
+    fake.random.setstate(state[1])
+
+
+def reconcile_with_journal(
+    cur: mysql.connector.cursor.MySQLCursor, args: argparse.Namespace, journal: LoadJournal
+) -> None:
+    """Trim every table part back to the rows its journal checkpoint covers.
+
+    A crash between a commit and its checkpoint leaves rows past the
+    checkpoint; those are deleted (and regenerated) so ids stay contiguous.
+    """
+    for table, _, count_arg, _ in TABLE_LOADS:
+        count = getattr(args, count_arg)
+        pk = primary_key(table)
+        unfinished = False
+        for shards in table_parts(args, table, count):
+            first, last = shards.start * SHARD_ROWS, min(shards.stop * SHARD_ROWS, count)
+            unfinished = unfinished or not journal.done(table, first)
+            committed = first + journal.rows(table, first)
+            cur.execute(f"SELECT MAX({pk}) FROM {table} WHERE {pk} > %s AND {pk} <= %s", (first, last))
+            (max_id,) = cur.fetchone()
+            if (max_id or first) < committed:
+                raise SystemExit(
+                    f"{table} ends at id {max_id or first} but {args.journal} records rows up to "
+                    f"id {committed}; delete the journal to start over"
+                )
+            if max_id is not None and max_id > committed:
+                cur.execute(f"DELETE FROM {table} WHERE {pk} > %s AND {pk} <= %s", (committed, last))
+        if unfinished:
+            # Rolled-back and deleted inserts still advanced the counter; InnoDB
+            # moves it back to MAX(id) + 1 when asked for anything lower.
+            cur.execute(f"ALTER TABLE {table} AUTO_INCREMENT = 1")
+
 
-        atm_rows = [
-            (
-                random.randint(1, args.branches),
-                fake.street_address(),
-                random.choice(cities),
-                random.choice(["Active", "Inactive"]),
+def load_database(
+    args: argparse.Namespace,
+    fake: Faker | PooledFaker,
+    rng: random.Random,
+    executor: ProcessPoolExecutor | None,
+    metrics: LoadMetrics,
+    checksums: ChecksumManifest | None = None,
+) -> None:
+    import mysql.connector
+    import mysql.connector.pooling
+
+    strategy = args.strategy
+    conn = mysql.connector.connect(
+        host=args.host,
+        user=args.user,
+        password=args.password,
+        allow_local_infile=strategy == "load-data",
+    )
+    cur = conn.cursor()
+
+    journal = LoadJournal.open(args.journal, journal_fingerprint(args)) if args.resume else None
+    # Only a single stream shares one generator across tables; shards and
+    # counter-based rows need no saved state.
+    single_stream = executor is None and args.connections == 1 and args.generator == "stream"
+    capture = functools.partial(generator_state, fake, rng) if single_stream else None
+
+    try:
+        cur.execute(f"CREATE DATABASE IF NOT EXISTS {args.database}")
+        cur.execute(f"USE {args.database}")
+        if journal is not None and journal.resumed:
+            print(f"Resuming from {args.journal}")
+            reconcile_with_journal(cur, args, journal)
+            if single_stream and journal.state() is not None:
+                set_generator_state(fake, rng, journal.state())
+        elif args.append:
+            prepare_append(get_backend("mysql"), cur, args, fake, rng)
+        else:
+            create_schema(cur, deferred_constraints=args.fast_load, partitions=args.partitions)
+        conn.commit()
+        if args.fast_load:
+            apply_fast_load_session(cur)
+
+        if strategy == "load-data" and not local_infile_supported(cur, TABLE_LOADS[0][0]):
+            print("local_infile is disabled on the client or server; falling back to executemany")
+            strategy = "executemany"
+
+        if args.connections > 1:
+            pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name="bank_loader",
+                pool_size=args.connections,
+                host=args.host,
+                user=args.user,
+                password=args.password,
+                database=args.database,
+                allow_local_infile=strategy == "load-data",
             )
-            for _ in range(args.atms)
-        ]
-        insert_batched(
-            conn,
-            cur,
-            "INSERT INTO atm_locations (branch_id, location, city, status) VALUES (%s,%s,%s,%s)",
-            atm_rows,
-            args.batch_size,
-            "atm_locations",
-        )
+            load_tables_parallel(pool, args, executor, strategy, metrics, journal, checksums)
+            for table, columns, count_arg, plan in TABLE_LOADS:
+                if table in args.partitions:
+                    count = getattr(args, count_arg)
+                    load_partitioned(
+                        args, fake, rng, executor, table, columns, plan, count, metrics.table(table), checksums
+                    )
+        else:
+            for table, columns, count_arg, plan in TABLE_LOADS:
+                if journal is not None and journal.done(table):
+                    continue
+                count = getattr(args, count_arg)
+                if table in args.partitions:
+                    load_partitioned(
+                        args, fake, rng, executor, table, columns, plan, count, metrics.table(table), checksums
+                    )
+                    continue
+                committed = journal.rows(table) if journal else 0
+                batches, total_batches = table_batches(
+                    args, fake, rng, executor, table, plan, count, committed
+                )
+                if checksums is not None:
+                    batches = checksums.track(table, batches, existing_rows(args, table) + 1)
+                load_batches(
+                    conn,
+                    cur,
+                    table,
+                    columns,
+                    batches,
+                    total_batches,
+                    table,
+                    strategy,
+                    metrics.table(table),
+                    adaptive_start(args),
+                    PartProgress(journal, table, 0, committed, capture) if journal else None,
+                    args.pipeline,
+                )
+
+        if args.fast_load:
+            print("Validating and adding foreign keys...")
+            restore_constraints(cur, args.partitions)
+            conn.commit()
+        if journal is not None:
+            journal.remove()
+
+        for key, label in (("strategy", "Insert strategy"), ("adaptive_batch", "Adaptive batch size")):
+            chosen = metrics.notes(key)
+            if chosen:
+                print(f"{label} per table:")
+                for table, values in chosen.items():
+                    print(f"  {table}: {', '.join(str(entry['chosen']) for entry in values)}")
 
         print("\n✅ All tables populated successfully with realistic banking data!")
     except mysql.connector.Error as exc:
@@ -422,5 +1646,44 @@ def main() -> None:
         conn.close()
 
 
+def run(args: argparse.Namespace) -> dict:
+    """Load (or export) the dataset ``args`` describes; returns the load report."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from faker import Faker
+
+    rng = random.Random(args.seed)
+    Faker.seed(args.seed)
+    fake = new_faker(args)
+    executor = (
+        ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker, initargs=(args,))
+        if args.workers > 1
+        else None
+    )
+    metrics = LoadMetrics(args.metrics_file, args.metrics_interval)
+    checksums = ChecksumManifest(get_backend(args.backend), TABLES) if args.manifest else None
+    try:
+        if args.output_dir:
+            export_dataset(args, fake, rng, executor)
+        elif args.backend != "mysql":
+            load_backend(args, fake, rng, executor, metrics, checksums)
+        else:
+            load_database(args, fake, rng, executor, metrics, checksums)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    if checksums is not None:
+        checksums.save(args.manifest, journal_fingerprint(args))
+        print(f"Checksum manifest written to {args.manifest}")
+    if args.report:
+        metrics.write_report(args.report)
+        print(f"Load report written to {args.report}")
+    return metrics.report()
+
+
+def main(argv: list[str] | None = None) -> None:
+    run(parse_args(argv))
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,123 @@
+"""Pick INSERT batch sizes per table from the server's packet limit and measured latency.
+
+``executemany`` on MySQL is rewritten into one multi-row INSERT per batch, so
+a batch must fit in ``max_allowed_packet``. The right number of rows below
+that limit depends on the row width and on how the server copes with large
+statements, so ``AdaptiveBatcher`` re-chunks the generated rows and keeps
+adjusting the batch size from the rows/s it observes:
+
+- the ceiling is ``max_allowed_packet * HEADROOM`` divided by the widest
+  encoded row seen so far (first estimated from a sample, then measured from
+  the statements actually sent);
+- every ``SAMPLES_PER_STEP`` full batches, the median rows/s of the current
+  size is compared with the previous size; the batcher keeps moving in the
+  same direction while it gets faster and turns around when it gets slower.
+
+Re-chunking never changes the generated rows, only how they are grouped.
+"""
+
+from __future__ import annotations
+
+import statistics
+from typing import Iterable, Iterator
+
+from dataset_export import sql_literal
+
+HEADROOM = 0.8
+GROWTH = 1.5
+SAMPLES_PER_STEP = 3
+# Rates within this fraction of each other count as no change.
+NOISE = 0.05
+SAMPLE_ROWS = 200
+MIN_BATCH = 100
+MAX_BATCH = 100_000
+
+
+def max_allowed_packet(cur) -> int:
+    cur.execute("SELECT @@max_allowed_packet")
+    (value,) = cur.fetchone()
+    return int(value)
+
+
+def encoded_row_bytes(rows: Iterable[tuple]) -> int:
+    """Widest ``(v1,v2,...),`` tuple these rows produce in a multi-row INSERT."""
+    return max(
+        (len(",".join(sql_literal(value) for value in row).encode()) + 3 for row in rows), default=1
+    )
+
+
+class AdaptiveBatcher:
+    def __init__(self, packet_bytes: int, initial: int) -> None:
+        self.packet_bytes = packet_bytes
+        self.limit = int(packet_bytes * HEADROOM)
+        self.initial = initial
+        self.size = initial
+        self.step = 0
+        self.minimum = min(MIN_BATCH, initial)
+        self.row_bytes: int | None = None
+        self.direction = 1
+        self.previous_rate: float | None = None
+        self.pending_rates: list[float] = []
+        self.tried: dict[int, float] = {}
+
+    @classmethod
+    def for_cursor(cls, cur, initial: int) -> AdaptiveBatcher:
+        return cls(max_allowed_packet(cur), initial)
+
+    @property
+    def ceiling(self) -> int:
+        if self.row_bytes is None:
+            return MAX_BATCH
+        return max(1, min(MAX_BATCH, self.limit // self.row_bytes))
+
+    def rebatch(self, batches: Iterable[list[tuple]]) -> Iterator[list[tuple]]:
+        """Regroup ``batches`` into lists of the current ``size``."""
+        pending: list[tuple] = []
+        for batch in batches:
+            if self.row_bytes is None and batch:
+                self.row_bytes = encoded_row_bytes(batch[:SAMPLE_ROWS])
+            pending.extend(batch)
+            while len(pending) >= min(self.size, self.ceiling):
+                size = min(self.size, self.ceiling)
+                yield pending[:size]
+                del pending[:size]
+        if pending:
+            yield pending
+
+    def observe(self, rows: int, seconds: float, nbytes: int = 0) -> None:
+        """Feed back the execute+commit time of one batch (and its statement size)."""
+        if nbytes and rows:
+            self.row_bytes = max(self.row_bytes or 0, -(-nbytes // rows))
+        self.size = min(self.size, self.ceiling)
+        if rows < self.size or seconds <= 0:
+            return  # the short final batch is not comparable
+        self.pending_rates.append(rows / seconds)
+        if len(self.pending_rates) < SAMPLES_PER_STEP:
+            return
+        rate = statistics.median(self.pending_rates)
+        self.pending_rates.clear()
+        self.tried[self.size] = rate
+        if self.previous_rate is not None and rate < self.previous_rate * (1 - NOISE):
+            self.direction = -self.direction
+        self.previous_rate = rate
+        # Sizes sit on a fixed geometric grid so revisits measure the same size.
+        self.step += self.direction
+        self.size = max(self.minimum, min(round(self.initial * GROWTH**self.step), self.ceiling))
+        if self.size != round(self.initial * GROWTH**self.step):
+            self.step -= self.direction
+
+    @property
+    def chosen(self) -> int:
+        """Fastest size measured so far (the current size if none completed a step)."""
+        if not self.tried:
+            return min(self.size, self.ceiling)
+        return max(self.tried, key=self.tried.get)
+
+    def summary(self) -> dict:
+        return {
+            "chosen": self.chosen,
+            "max_allowed_packet": self.packet_bytes,
+            "row_bytes": self.row_bytes,
+            "ceiling": self.ceiling,
+            "rows_per_s_by_size": {str(size): round(rate, 1) for size, rate in sorted(self.tried.items())},
+        }
@@ -0,0 +1,75 @@
+"""Run the loaders from Python instead of the command line.
+
+    from bank_loader import load
+
+    stats = load({"customers": 1_000, "accounts": 1_000, "backend": "sqlite", "sqlite_path": "bank.db"})
+    stats = load(schema="demo", customers=100, backend="sqlite", sqlite_path=":memory:")
+
+Options are the loader's command-line options with underscores for dashes
+(``batch_size``, ``faker_pool_size``, ``split=["transactions=4"]``, ...),
+given as a ``config`` dict, keywords or both; flags take booleans. Options
+left out keep their command-line defaults. Values go through the command
+line's parsing and validation: a wrong type, an unknown choice or an invalid
+combination prints the same usage error and raises ``SystemExit``. ``schema``
+picks the loader:
+
+- ``bank``: the 10-table ``LoadMassiveDataWith10Tabel`` (default).
+- ``demo``: the 3-table ``LoadMassiveDemoData``.
+- ``swapnil``: the 3-table ``bank_swapnil_demo``.
+
+``load`` returns the load report, as ``--report`` writes it: rows, seconds
+and phase timings per table. Nothing heavy is imported with this module;
+a load imports what it uses (Faker with only the providers its tables call,
+mysql.connector only for MySQL, NumPy only for ``vectorized``), so calling
+``load`` from tests or notebooks starts as fast as the load allows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+from typing import Any
+
+# Loader module behind each ``schema``.
+SCHEMAS = {"bank": "LoadMassiveDataWith10Tabel", "demo": "LoadMassiveDemoData", "swapnil": "bank_swapnil_demo"}
+
+
+def config_argv(parser: argparse.ArgumentParser, config: dict[str, Any]) -> list[str]:
+    """The command line giving ``parser`` the options in ``config``.
+
+    Going through the command line applies each option's ``type`` and
+    ``choices`` exactly as for the scripts. ``None`` keeps an option's
+    default; flags take booleans and repeatable options lists.
+    """
+    actions = {action.dest: action for action in parser._actions if action.option_strings}
+    unknown = sorted(config.keys() - actions.keys())
+    if unknown:
+        raise TypeError(f"unknown loader option(s): {', '.join(unknown)}")
+    argv = []
+    for key, value in config.items():
+        action = actions[key]
+        option = max(action.option_strings, key=len)
+        if value is None:
+            continue
+        if action.nargs == 0:
+            if not isinstance(value, bool):
+                raise TypeError(f"{key} is a flag; expected True or False, got {value!r}")
+            if value != action.default:
+                argv.append(option)
+        elif isinstance(action, argparse._AppendAction):
+            values = [value] if isinstance(value, str) else value
+            for item in values:
+                argv.append(f"{option}={item}")
+        else:
+            argv.append(f"{option}={value}")
+    return argv
+
+
+def load(config: dict[str, Any] | None = None, *, schema: str = "bank", **options: Any) -> dict:
+    """Run one load (or export) configured by ``config`` and ``options``; returns the load report."""
+    if schema not in SCHEMAS:
+        raise ValueError(f"unknown schema {schema!r}; expected one of {', '.join(SCHEMAS)}")
+    module = importlib.import_module(SCHEMAS[schema])
+    parser = module.build_parser()
+    args = parser.parse_args(config_argv(parser, {**(config or {}), **options}))
+    return module.run(module.check_args(parser, args))
@@ -0,0 +1,290 @@
+"""Benchmark row generation and ingestion throughput of the 10-table loader.
+
+Two kinds of cases are measured, each in a fresh process so peak RSS is
+per case:
+
+- ``generate``: one table generator from ``LoadMassiveDataWith10Tabel`` in
+  isolation, no database involved.
+- ``ingest``: the full 10-table load against SQLite (in memory) and, when a
+  server is reachable, MySQL, swept over batch sizes and insert strategies.
+
+Results (rows/s, MB/s of the tab-separated row encoding, peak RSS) are
+written as JSON; ``--compare`` checks them against an earlier run and exits
+non-zero on regressions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import LoadMassiveDataWith10Tabel as loader
+from db_backends import add_connection_args, tsv_line
+from load_metrics import LoadMetrics, peak_rss_bytes
+
+
+COUNT_ARGS = [
+    "--branches",
+    "--employees",
+    "--customers",
+    "--accounts",
+    "--transactions",
+    "--loans",
+    "--loan-payments",
+    "--cards",
+    "--card-transactions",
+    "--atms",
+]
+
+# Rows sampled per table to estimate encoded bytes for ingestion cases.
+SAMPLE_ROWS = 200
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000, help="rows per table")
+    parser.add_argument("--tables", help="comma-separated tables for generate cases (default: all)")
+    parser.add_argument("--batch-sizes", default="1000,5000", help="comma-separated sweep")
+    parser.add_argument("--strategies", default="executemany,prepared,load-data", help="MySQL strategies to sweep")
+    parser.add_argument("--vectorized", action="store_true")
+    parser.add_argument("--faker-pool-size", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-generate", action="store_true")
+    parser.add_argument("--skip-ingest", action="store_true")
+    parser.add_argument("--mysql", action="store_true", help="also ingest into MySQL if reachable")
+    add_connection_args(parser, "loader_benchmark")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare rows/s against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.10, help="allowed rows/s drop before flagging (0.10 = 10%%)"
+    )
+    return parser.parse_args()
+
+
+def peak_rss_mb() -> float | None:
+    peak = peak_rss_bytes()
+    return peak / (1024 * 1024) if peak is not None else None
+
+
+def rate(result: dict) -> str:
+    """``rows_per_s`` for printing; ``None`` when nothing was timed (e.g. ``--rows 0``)."""
+    if result["rows_per_s"] is None:
+        return f"{'n/a':>12}"
+    return f"{result['rows_per_s']:>12,.0f}"
+
+
+def loader_argv(options: dict, extra: list[str]) -> list[str]:
+    argv = ["--seed", str(options["seed"]), "--faker-pool-size", str(options["faker_pool_size"])]
+    for flag in COUNT_ARGS:
+        argv += [flag, str(options["rows"])]
+    if options["vectorized"]:
+        argv.append("--vectorized")
+    return argv + extra
+
+
+def generate_case(options: dict, table: str) -> dict:
+    """Time one table generator; encoding for the byte count happens off the clock."""
+    from faker import Faker
+
+    args = loader.parse_args(loader_argv(options, ["--batch-size", "2000"]))
+    _, columns, count_arg, plan = next(load for load in loader.TABLE_LOADS if load[0] == table)
+    count = getattr(args, count_arg)
+    make_batch = loader.batch_factory(table, plan, args.vectorized, args.generator)
+    rng = random.Random(args.seed)
+    Faker.seed(args.seed)
+    fake = loader.new_faker(args)
+
+    elapsed = 0.0
+    encoded = 0
+    for start in range(0, count, args.batch_size):
+        began = time.perf_counter()
+        batch = make_batch(fake, rng, args, start, min(start + args.batch_size, count))
+        elapsed += time.perf_counter() - began
+        encoded += sum(len(tsv_line(row).encode()) for row in batch)
+    return {
+        "kind": "generate",
+        "table": table,
+        "rows": count,
+        "seconds": elapsed,
+        "rows_per_s": count / elapsed if elapsed else None,
+        "mb_per_s": encoded / elapsed / 1e6 if elapsed else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def sample_bytes_per_row(args: argparse.Namespace) -> dict[str, float]:
+    sizes = {}
+    fake = loader.new_faker(args)
+    for table, _, count_arg, plan in loader.TABLE_LOADS:
+        n = min(SAMPLE_ROWS, getattr(args, count_arg))
+        rows = loader.batch_factory(table, plan, args.vectorized, args.generator)(fake, random.Random(0), args, 0, n)
+        sizes[table] = sum(len(tsv_line(row).encode()) for row in rows) / max(n, 1)
+    return sizes
+
+
+def ingest_case(options: dict, backend: str, strategy: str, batch_size: int, connection: dict) -> dict:
+    """Run the whole 10-table load once and time it end to end."""
+    from faker import Faker
+
+    extra = ["--batch-size", str(batch_size), "--backend", backend]
+    if backend == "sqlite":
+        extra += ["--sqlite-path", ":memory:"]
+    else:
+        extra += ["--strategy", strategy]
+        for key in ("host", "user", "password", "database"):
+            extra += [f"--{key}", connection[key]]
+    args = loader.parse_args(loader_argv(options, extra))
+    bytes_per_row = sample_bytes_per_row(args)
+
+    rng = random.Random(args.seed)
+    Faker.seed(args.seed)
+    fake = loader.new_faker(args)
+    began = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if backend == "sqlite":
+            loader.load_backend(args, fake, rng, None, LoadMetrics())
+        else:
+            loader.load_database(args, fake, rng, None, LoadMetrics())
+    elapsed = time.perf_counter() - began
+
+    rows = sum(getattr(args, count_arg) for _, _, count_arg, _ in loader.TABLE_LOADS)
+    encoded = sum(
+        getattr(args, count_arg) * bytes_per_row[table] for table, _, count_arg, _ in loader.TABLE_LOADS
+    )
+    return {
+        "kind": "ingest",
+        "backend": backend,
+        "strategy": strategy,
+        "batch_size": batch_size,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_s": rows / elapsed,
+        "mb_per_s": encoded / elapsed / 1e6,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(func, *args) -> dict:
+    # A fresh interpreter per case keeps ru_maxrss meaningful for that case.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(func, *args).result()
+
+
+def mysql_available(connection: dict) -> bool:
+    import mysql.connector
+
+    try:
+        conn = mysql.connector.connect(
+            host=connection["host"], user=connection["user"], password=connection["password"]
+        )
+    except mysql.connector.Error as exc:
+        print(f"Skipping MySQL cases: {exc}")
+        return False
+    conn.close()
+    return True
+
+
+def case_key(result: dict) -> tuple:
+    return tuple(
+        result.get(field)
+        for field in ("kind", "table", "backend", "strategy", "batch_size", "vectorized", "faker_pool_size")
+    )
+
+
+def compare(results: list[dict], baseline_path: str, tolerance: float) -> bool:
+    """Print rows/s changes against ``baseline_path``; returns False on any regression."""
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = {case_key(result): result for result in json.load(handle)["results"]}
+    ok = True
+    for result in results:
+        before = baseline.get(case_key(result))
+        if not before or not before.get("rows_per_s") or not result.get("rows_per_s"):
+            continue
+        change = result["rows_per_s"] / before["rows_per_s"] - 1
+        flag = "REGRESSION" if change < -tolerance else ""
+        ok = ok and not flag
+        label = " ".join(str(part) for part in case_key(result)[:5] if part is not None)
+        print(f"{label:<50} {before['rows_per_s']:>12,.0f} -> {result['rows_per_s']:>12,.0f} rows/s "
+              f"({change:+.1%}) {flag}")
+    return ok
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def main() -> None:
+    args = parse_args()
+    os.environ.setdefault("TQDM_DISABLE", "1")
+    options = {
+        "rows": args.rows,
+        "seed": args.seed,
+        "vectorized": args.vectorized,
+        "faker_pool_size": args.faker_pool_size,
+    }
+    connection = {key: getattr(args, key) for key in ("host", "user", "password", "database")}
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    tables = args.tables.split(",") if args.tables else [load[0] for load in loader.TABLE_LOADS]
+
+    results: list[dict] = []
+    if not args.skip_generate:
+        for table in tables:
+            results.append(run_isolated(generate_case, options, table))
+            print(f"generate {table:<18} {rate(results[-1])} rows/s")
+    if not args.skip_ingest:
+        cases = [("sqlite", "executemany", size) for size in batch_sizes]
+        if args.mysql and mysql_available(connection):
+            cases += [
+                ("mysql", strategy, size)
+                for strategy in args.strategies.split(",")
+                for size in batch_sizes
+            ]
+        for backend, strategy, size in cases:
+            results.append(run_isolated(ingest_case, options, backend, strategy, size, connection))
+            print(f"ingest {backend:<8} {strategy:<12} batch={size:<6} "
+                  f"{rate(results[-1])} rows/s")
+
+    for result in results:
+        result["vectorized"] = args.vectorized
+        result["faker_pool_size"] = args.faker_pool_size
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows_per_table": args.rows,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
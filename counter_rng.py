@@ -0,0 +1,129 @@
+"""Counter-based random numbers: every value is a pure function of its coordinates.
+
+The default generators consume one sequential stream per table, so row
+750,000 can only be produced after rows 0-749,999. Here each value is a
+SplitMix64 hash of ``(key, row, draw)``, where the key is derived from the seed,
+the table and the stream or column. Any row, or any ``[start, stop)``
+slice, can therefore be produced on its own and always comes out the same.
+
+- ``CounterRandom`` is a ``random.Random`` whose draws hash
+  ``(key, row, draw number)``. ``at(row)`` moves it to a row, so row
+  factories and Faker (whose providers all draw from ``generator.random``)
+  run unchanged.
+- ``CounterColumns`` stands in for ``numpy.random.Generator`` over a slice
+  of rows. Each ``integers``/``choice``/``random`` call is the next column
+  and hashes ``(column key, row)`` for the whole slice at once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MASK64 = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+MIX1 = 0xBF58476D1CE4E5B9
+MIX2 = 0x94D049BB133111EB
+TO_UNIT = 2.0**-53
+
+
+def mix64(x: int) -> int:
+    """SplitMix64 output function."""
+    x = (x + GOLDEN) & MASK64
+    x = ((x ^ (x >> 30)) * MIX1) & MASK64
+    x = ((x ^ (x >> 27)) * MIX2) & MASK64
+    return x ^ (x >> 31)
+
+
+def stream_key(seed: int, *names: object) -> int:
+    """Stable 64-bit key for ``seed`` and names such as table and column."""
+    text = ":".join(str(part) for part in (seed, *names))
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+
+
+class CounterRandom(random.Random):
+    """``random.Random`` whose n-th draw in row r is ``mix64`` of (key, r, n)."""
+
+    def __init__(self, key: int = 0) -> None:
+        super().__init__(key)
+
+    def seed(self, a=None, version: int = 2) -> None:
+        # Faker's seed_instance() lands here; a counter stream is positioned
+        # with at(), so seeding only rekeys it.
+        self.key = a & MASK64 if isinstance(a, int) else stream_key(0, a)
+        self.row_key = mix64(self.key)
+        self.draw = 0
+        self.gauss_next = None
+
+    def at(self, row: int) -> CounterRandom:
+        self.row_key = mix64(self.key ^ mix64(row))
+        self.draw = 0
+        return self
+
+    def _next64(self) -> int:
+        self.draw += 1
+        return mix64((self.row_key + self.draw * GOLDEN) & MASK64)
+
+    def random(self) -> float:
+        return (self._next64() >> 11) * TO_UNIT
+
+    def getrandbits(self, k: int) -> int:
+        value = 0
+        for shift in range(0, k, 64):
+            value |= self._next64() << shift
+        return value & ((1 << k) - 1)
+
+    def getstate(self) -> tuple:
+        return self.key, self.row_key, self.draw
+
+    def setstate(self, state: tuple) -> None:
+        self.key, self.row_key, self.draw = state
+
+
+def mix64_array(x: np.ndarray) -> np.ndarray:
+    """:func:`mix64` over a ``uint64`` array (NumPy wraps the products mod 2**64)."""
+    import numpy as np
+
+    x = x + np.uint64(GOLDEN)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(MIX1)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(MIX2)
+    return x ^ (x >> np.uint64(31))
+
+
+class CounterColumns:
+    """The subset of ``numpy.random.Generator`` the batch factories use, for rows ``[start, stop)``."""
+
+    def __init__(self, key: int, start: int, stop: int) -> None:
+        # NumPy is optional and slow to import; only --vectorized loads get here.
+        import numpy as np
+
+        self.np = np
+        self.key = key
+        self.rows = np.arange(start, stop, dtype=np.uint64)
+        self.column = 0
+
+    def _unit(self, size: int | None) -> np.ndarray:
+        if size is not None and size != len(self.rows):
+            raise ValueError("counter columns draw exactly one value per row")
+        self.column += 1
+        column_key = self.np.uint64(mix64(self.key ^ mix64(self.column)))
+        with self.np.errstate(over="ignore"):
+            bits = mix64_array(self.rows ^ column_key)
+        return (bits >> self.np.uint64(11)).astype(self.np.float64) * TO_UNIT
+
+    def random(self, size: int | None = None) -> np.ndarray:
+        return self._unit(size)
+
+    def integers(self, low: int, high: int | None = None, size: int | None = None, endpoint: bool = False):
+        if high is None:
+            low, high = 0, low
+        span = high - low + (1 if endpoint else 0)
+        return low + (self._unit(size) * span).astype(self.np.int64)
+
+    def choice(self, options: Sequence, size: int | None = None) -> np.ndarray:
+        options = self.np.asarray(options)
+        return options[(self._unit(size) * len(options)).astype(self.np.int64)]
@@ -0,0 +1,188 @@
+"""Write generated datasets to compressed, size-capped chunk files.
+
+The loaders use this for ``--output-dir``: instead of inserting into MySQL,
+the DDL goes to ``schema.sql`` and every table is streamed into numbered
+gzip/zstd chunk files (multi-row INSERT statements or CSV) described by
+``manifest.json``. ``restore_dataset.py`` loads such a directory back in
+parallel.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import os
+import textwrap
+from datetime import date, datetime
+from decimal import Decimal
+from typing import IO, Iterable
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for --compression zstd
+    zstandard = None
+
+
+MANIFEST = "manifest.json"
+SCHEMA_FILE = "schema.sql"
+EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+CSV_NULL = "\\N"
+
+SQL_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "'": "\\'", "\n": "\\n", "\r": "\\r", "\0": "\\0", "\x1a": "\\Z"}
+)
+
+
+def add_export_args(parser) -> None:
+    parser.add_argument(
+        "--output-dir",
+        help="write schema.sql and compressed data chunks here instead of loading MySQL",
+    )
+    parser.add_argument("--export-format", choices=["sql", "csv"], default="sql")
+    parser.add_argument("--compression", choices=["gzip", "zstd"], default="gzip")
+    parser.add_argument(
+        "--chunk-mb", type=int, default=64, help="uncompressed size cap per chunk file"
+    )
+
+
+class SchemaRecorder:
+    """Cursor stand-in that records the statements ``create_schema`` executes."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def execute(self, sql: str, params: tuple | None = None) -> None:
+        self.statements.append(textwrap.dedent(sql).strip())
+
+
+def sql_literal(value: object) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return f"'{value}'"
+    return "'" + str(value).translate(SQL_ESCAPES) + "'"
+
+
+def open_compressed(path: str, compression: str, mode: str) -> IO:
+    """Open ``path`` as text through the chosen compressor (``mode`` is "r" or "w")."""
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    if zstandard is None:
+        raise SystemExit("zstd compression requires zstandard (pip install zstandard)")
+    raw = open(path, mode + "b")
+    if mode == "w":
+        stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+    else:
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+
+class DatasetWriter:
+    """Stream tables into chunk files of at most ``chunk_bytes`` uncompressed bytes.
+
+    Rows are written as they arrive, so memory stays bounded by one batch.
+    Primary keys are written explicitly so chunks can be restored concurrently
+    and still reproduce the same ids.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        database: str,
+        fmt: str = "sql",
+        compression: str = "gzip",
+        chunk_bytes: int = 64 * 1024 * 1024,
+        rows_per_insert: int = 1_000,
+    ) -> None:
+        if compression == "zstd" and zstandard is None:
+            raise SystemExit("zstd compression requires zstandard (pip install zstandard)")
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.compression = compression
+        self.chunk_bytes = chunk_bytes
+        self.rows_per_insert = rows_per_insert
+        self.manifest: dict = {
+            "database": database,
+            "format": fmt,
+            "compression": compression,
+            "schema": SCHEMA_FILE,
+            "tables": [],
+        }
+
+    def write_schema(self, statements: Iterable[str]) -> None:
+        with open(os.path.join(self.output_dir, SCHEMA_FILE), "w", encoding="utf-8") as handle:
+            for statement in statements:
+                handle.write(statement.rstrip(";") + ";\n\n")
+
+    def write_table(
+        self,
+        table: str,
+        primary_key: str,
+        columns: tuple[str, ...],
+        batches: Iterable[list[tuple]],
+        first_id: int = 1,
+    ) -> int:
+        """Write ``batches`` for ``table``; returns the number of rows written."""
+        columns = (primary_key, *columns)
+        entry = {"name": table, "columns": list(columns), "rows": 0, "chunks": []}
+        self.manifest["tables"].append(entry)
+        handle: IO | None = None
+        written = 0
+        next_id = first_id
+        pending: list[str] = []
+        # Encoded size of the rows in ``pending``, which count toward the chunk before they are written.
+        pending_bytes = 0
+        line = io.StringIO()
+        line_writer = csv.writer(line, lineterminator="\n")
+
+        def open_chunk() -> IO:
+            name = f"{table}.{len(entry['chunks']):05d}.{self.fmt}{EXTENSIONS[self.compression]}"
+            entry["chunks"].append(name)
+            return open_compressed(os.path.join(self.output_dir, name), self.compression, "w")
+
+        def flush_insert() -> None:
+            nonlocal written, pending_bytes
+            text = f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n" + ",\n".join(pending) + ";\n"
+            handle.write(text)
+            written += len(text.encode())
+            pending.clear()
+            pending_bytes = 0
+
+        for batch in batches:
+            for row in batch:
+                if handle is None or written + pending_bytes >= self.chunk_bytes:
+                    if pending:
+                        flush_insert()
+                    if handle is not None:
+                        handle.close()
+                    handle, written = open_chunk(), 0
+                row = (next_id, *row)
+                next_id += 1
+                if self.fmt == "csv":
+                    line.seek(0)
+                    line.truncate()
+                    line_writer.writerow([CSV_NULL if value is None else value for value in row])
+                    text = line.getvalue()
+                    handle.write(text)
+                    written += len(text.encode())
+                else:
+                    values = "(" + ",".join(sql_literal(value) for value in row) + ")"
+                    pending.append(values)
+                    pending_bytes += len(values.encode()) + 2
+                    if len(pending) >= self.rows_per_insert:
+                        flush_insert()
+            entry["rows"] += len(batch)
+        if pending:
+            flush_insert()
+        if handle is not None:
+            handle.close()
+        return entry["rows"]
+
+    def close(self) -> None:
+        with open(os.path.join(self.output_dir, MANIFEST), "w", encoding="utf-8") as handle:
+            json.dump(self.manifest, handle, indent=2)
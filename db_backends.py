@@ -0,0 +1,423 @@
+"""Database backends for the loaders: connection, DDL translation and bulk ingestion.
+
+The loaders' schemas are written in MySQL DDL. Each backend translates that
+DDL for its engine and ingests batches through the fastest path it has:
+
+- ``mysql``: ``executemany`` (rewritten to multi-row INSERTs), commit per batch.
+- ``sqlite``: one transaction per table with journaling and fsync turned off.
+- ``postgres``: ``COPY ... FROM STDIN`` in text format, commit per batch.
+
+SQLite needs no server, so ``--backend sqlite --sqlite-path :memory:`` runs
+the whole pipeline in-process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import re
+import sqlite3
+import time
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Iterable
+
+from row_checksums import column_kind
+
+if TYPE_CHECKING:
+    from load_metrics import TableStats
+
+TSV_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"}
+)
+# COPY reads ``\0`` as an octal escape for NUL, which PostgreSQL text cannot
+# store, so NUL is left unescaped and rejected before the COPY.
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+AUTO_INCREMENT_RE = re.compile(r"(\w+) (BIG)?INT AUTO_INCREMENT PRIMARY KEY")
+ENUM_RE = re.compile(r"(\w+) ENUM\(([^)]*)\)")
+SEQ_SCAN_RE = re.compile(r"Seq Scan on (\w+)(?: (\w+))?")
+
+
+def tsv_line(row: tuple, escapes: dict = TSV_ESCAPES) -> str:
+    """Encode a row in the tab-separated text format shared by LOAD DATA and COPY (``COPY_ESCAPES``)."""
+    fields = ["\\N" if value is None else str(value).translate(escapes) for value in row]
+    return "\t".join(fields) + "\n"
+
+
+def statement_bytes(cur) -> int:
+    """Encoded size of the statement ``cur`` last sent (``cur.statement`` is text)."""
+    statement = cur.statement or ""
+    return len(statement.encode() if isinstance(statement, str) else statement)
+
+
+def timed(batches: Iterable[list[tuple]], stats: TableStats | None):
+    """``(batch, generate seconds)`` pairs; the timing is skipped without ``stats``."""
+    if stats is not None:
+        return stats.timed(batches)
+    return ((batch, 0.0) for batch in batches)
+
+
+def add_connection_args(
+    parser: argparse.ArgumentParser, database: str | None, database_help: str | None = None
+) -> None:
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="root")
+    parser.add_argument("--database", default=database, help=database_help)
+
+
+def add_backend_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="mysql")
+    parser.add_argument(
+        "--sqlite-path",
+        help="SQLite database file for --backend sqlite (default: <database>.sqlite3; "
+        "':memory:' keeps it in-process)",
+    )
+    parser.add_argument("--port", type=int, help="server port (default: the backend's own)")
+
+
+class MySQLBackend:
+    name = "mysql"
+    errors: tuple[type[Exception], ...] = ()
+    placeholder = "%s"
+    # FLOAT columns store single precision; DATETIME rounds to whole seconds.
+    float32 = True
+    rounds_seconds = True
+
+    def __init__(self) -> None:
+        # Imported here rather than at module level: SQLite and PostgreSQL
+        # loads never pay for the connector.
+        import mysql.connector
+
+        self.connector = mysql.connector
+        self.errors = (mysql.connector.Error,)
+
+    def connect(self, args: argparse.Namespace):
+        options = {"host": args.host, "user": args.user, "password": args.password}
+        if getattr(args, "port", None):
+            options["port"] = args.port
+        return self.connector.connect(**options)
+
+    def use_database(self, cur, database: str, recreate: bool = False) -> None:
+        if recreate:
+            cur.execute(f"DROP DATABASE IF EXISTS {database}")
+        cur.execute(f"CREATE DATABASE IF NOT EXISTS {database}")
+        cur.execute(f"USE {database}")
+
+    def translate_ddl(self, ddl: str) -> str:
+        return ddl
+
+    def create_schema(self, cur, statements: Iterable[str]) -> None:
+        """Run MySQL DDL (e.g. captured with ``SchemaRecorder``) translated for this engine."""
+        for statement in statements:
+            cur.execute(self.translate_ddl(statement))
+
+    def insert_sql(self, table: str, columns: tuple[str, ...]) -> str:
+        placeholders = ",".join([self.placeholder] * len(columns))
+        return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+    def table_extent(self, cur, table: str, key: str) -> tuple[int, int]:
+        """Row count and highest ``key`` (0 when empty) of an existing table."""
+        cur.execute(f"SELECT COUNT(*), COALESCE(MAX({key}), 0) FROM {table}")
+        rows, max_id = cur.fetchone()
+        return int(rows), int(max_id)
+
+    def row_hash(self, text: str) -> int:
+        """Python side of ``row_hash_sql``, applied to the row rendered by ``row_checksums``."""
+        return zlib.crc32(text.encode())
+
+    def row_hash_sql(self, columns: list[tuple[str, str]]) -> str:
+        """Expression hashing a row's ``(name, sql_type)`` columns like ``row_hash``."""
+        return f"CRC32(CONCAT_WS('|', {', '.join(self.render_sql(*column) for column in columns)}))"
+
+    def render_sql(self, name: str, sql_type: str) -> str:
+        kind, _ = column_kind(sql_type)
+        return f"FLOOR({name} * 100)" if kind == "float" else name
+
+    def explain(self, cur, sql: str, params: tuple) -> tuple[list[str], set[str]]:
+        """Plan of ``sql`` as text lines, and the tables or aliases it reads with a full scan."""
+        cur.execute(f"EXPLAIN {sql}", params)
+        names = [column[0] for column in cur.description]
+        rows = [dict(zip(names, row)) for row in cur.fetchall()]
+        lines = [
+            " ".join(f"{name}={row[name]}" for name in ("table", "type", "key", "rows", "Extra") if row.get(name))
+            for row in rows
+        ]
+        return lines, {row["table"] for row in rows if row.get("type") == "ALL"}
+
+    def continue_ids(self, cur, table: str, key: str, max_id: int) -> None:
+        """Make ``max_id + 1`` the next generated ``key``.
+
+        Rolled-back inserts leave the counter past the highest id; appended
+        rows must continue right after the existing ones.
+        """
+        # InnoDB raises a value below MAX(id) + 1 back to MAX(id) + 1.
+        cur.execute(f"ALTER TABLE {table} AUTO_INCREMENT = {max_id + 1}")
+
+    def inserted_ids(self, cur, rows: int) -> range:
+        """AUTO_INCREMENT ids of the ``rows`` rows the last insert on ``cur`` wrote.
+
+        Assumes nothing else inserts into the table meanwhile, so one
+        statement's ids are consecutive.
+        """
+        # A multi-row INSERT reports the id of its first row.
+        return range(cur.lastrowid, cur.lastrowid + rows)
+
+    def bulk_insert(
+        self,
+        conn,
+        cur,
+        table: str,
+        columns: tuple[str, ...],
+        batches: Iterable[list[tuple]],
+        stats: TableStats | None = None,
+        ids: list[range] | None = None,
+    ) -> int:
+        """Insert every batch; returns the number of rows written.
+
+        ``stats``, when given, receives per-batch phase timings. ``ids``, when
+        given, collects each batch's ``inserted_ids`` so children can use the
+        new keys without reading them back.
+        """
+        sql = self.insert_sql(table, columns)
+        rows = 0
+        for batch, generate in timed(batches, stats):
+            began = time.perf_counter()
+            cur.executemany(sql, batch)
+            if ids is not None:
+                ids.append(self.inserted_ids(cur, len(batch)))
+            executed = time.perf_counter()
+            conn.commit()
+            if stats is not None:
+                stats.record(
+                    len(batch),
+                    generate=generate,
+                    execute=executed - began,
+                    commit=time.perf_counter() - executed,
+                    nbytes=statement_bytes(cur),
+                )
+            rows += len(batch)
+        return rows
+
+
+class SQLiteBackend(MySQLBackend):
+    name = "sqlite"
+    errors = (sqlite3.Error,)
+    placeholder = "?"
+    float32 = False
+    rounds_seconds = False
+
+    def __init__(self) -> None:
+        pass
+
+    def connect(self, args: argparse.Namespace):
+        for kind, adapt in ((date, date.isoformat), (datetime, str), (Decimal, str)):
+            sqlite3.register_adapter(kind, adapt)
+        path = args.sqlite_path or f"{args.database}.sqlite3"
+        conn = sqlite3.connect(path)
+        conn.create_function("crc32", 1, self.row_hash, deterministic=True)
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def use_database(self, cur, database: str, recreate: bool = False) -> None:
+        # One database per file; recreating it means dropping every table.
+        if recreate:
+            cur.execute("PRAGMA foreign_keys = OFF")
+            cur.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+            for (table,) in cur.fetchall():
+                cur.execute(f"DROP TABLE {table}")
+            cur.execute("PRAGMA foreign_keys = ON")
+
+    def translate_ddl(self, ddl: str) -> str:
+        ddl = AUTO_INCREMENT_RE.sub(r"\1 INTEGER PRIMARY KEY", ddl)
+        return ENUM_RE.sub(r"\1 TEXT CHECK (\1 IN (\2))", ddl)
+
+    def continue_ids(self, cur, table: str, key: str, max_id: int) -> None:
+        pass  # an INTEGER PRIMARY KEY always continues at MAX(rowid) + 1
+
+    def row_hash_sql(self, columns: list[tuple[str, str]]) -> str:
+        # crc32() is registered on connect; concat_ws() needs SQLite 3.44.
+        rendered = " || '|' || ".join(self.render_sql(*column) for column in columns)
+        return f"crc32({rendered})"
+
+    def render_sql(self, name: str, sql_type: str) -> str:
+        # Column types are only affinities here: values keep what was inserted.
+        kind, scale = column_kind(sql_type)
+        if kind == "decimal":
+            return f"printf('%.{scale}f', {name})"
+        if kind == "float":
+            return f"CAST({name} * 100 AS INTEGER)"
+        if kind == "datetime":
+            return f"substr({name}, 1, 19)"
+        return name
+
+    def explain(self, cur, sql: str, params: tuple) -> tuple[list[str], set[str]]:
+        cur.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        lines = [row[-1] for row in cur.fetchall()]
+        # "SCAN transactions" or "SCAN customers AS c" (older versions: "SCAN TABLE ...");
+        # "SCAN ... USING INDEX" walks an index instead of the table.
+        scanned = set()
+        for line in lines:
+            words = line.replace("SCAN TABLE ", "SCAN ").split()
+            if words[0] == "SCAN" and "USING" not in words:
+                scanned.add(words[1])
+                if words[2:3] == ["AS"]:
+                    scanned.add(words[3])
+        return lines, scanned
+
+    def inserted_ids(self, cur, rows: int) -> range:
+        cur.execute("SELECT last_insert_rowid()")
+        (last,) = cur.fetchone()
+        return range(last - rows + 1, last + 1)
+
+    def bulk_insert(
+        self,
+        conn,
+        cur,
+        table: str,
+        columns: tuple[str, ...],
+        batches: Iterable[list[tuple]],
+        stats: TableStats | None = None,
+        ids: list[range] | None = None,
+    ) -> int:
+        # One transaction per table: committing every batch would rewrite the
+        # same B-tree pages over and over.
+        sql = self.insert_sql(table, columns)
+        rows = 0
+        for batch, generate in timed(batches, stats):
+            began = time.perf_counter()
+            cur.executemany(sql, batch)
+            if ids is not None:
+                ids.append(self.inserted_ids(cur, len(batch)))
+            if stats is not None:
+                stats.record(len(batch), generate=generate, execute=time.perf_counter() - began)
+            rows += len(batch)
+        began = time.perf_counter()
+        conn.commit()
+        if stats is not None:
+            stats.record(0, commit=time.perf_counter() - began)
+        return rows
+
+
+class PostgresBackend(MySQLBackend):
+    name = "postgres"
+    # TIMESTAMP keeps microseconds.
+    rounds_seconds = False
+
+    def __init__(self) -> None:
+        try:
+            import psycopg2
+        except ImportError as exc:
+            raise SystemExit("--backend postgres requires psycopg2 (pip install psycopg2-binary)") from exc
+        self.psycopg2 = psycopg2
+        self.errors = (psycopg2.Error,)
+
+    def connect(self, args: argparse.Namespace):
+        options = {"host": args.host, "user": args.user, "password": args.password}
+        if getattr(args, "port", None):
+            options["port"] = args.port
+        try:
+            return self.psycopg2.connect(dbname=args.database, **options)
+        except self.psycopg2.OperationalError as exc:
+            if "does not exist" not in str(exc):
+                raise
+        admin = self.psycopg2.connect(dbname="postgres", **options)
+        admin.autocommit = True
+        with admin.cursor() as cur:
+            cur.execute(f'CREATE DATABASE "{args.database}"')
+        admin.close()
+        return self.psycopg2.connect(dbname=args.database, **options)
+
+    def use_database(self, cur, database: str, recreate: bool = False) -> None:
+        if recreate:
+            cur.execute("DROP SCHEMA public CASCADE")
+            cur.execute("CREATE SCHEMA public")
+
+    def translate_ddl(self, ddl: str) -> str:
+        ddl = AUTO_INCREMENT_RE.sub(
+            lambda m: f"{m.group(1)} {'BIGSERIAL' if m.group(2) else 'SERIAL'} PRIMARY KEY", ddl
+        )
+        ddl = ENUM_RE.sub(r"\1 VARCHAR(20) CHECK (\1 IN (\2))", ddl)
+        ddl = re.sub(r"\bDATETIME\b", "TIMESTAMP", ddl)
+        return re.sub(r"\bFLOAT\b", "REAL", ddl)
+
+    def continue_ids(self, cur, table: str, key: str, max_id: int) -> None:
+        cur.execute("SELECT setval(pg_get_serial_sequence(%s, %s), %s, false)", (table, key, max_id + 1))
+
+    def row_hash(self, text: str) -> int:
+        # No CRC32 built in; the first 32 bits of MD5 serve the same purpose.
+        return int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+
+    def row_hash_sql(self, columns: list[tuple[str, str]]) -> str:
+        rendered = ", ".join(self.render_sql(*column) for column in columns)
+        return f"('x' || substr(md5(concat_ws('|', {rendered})), 1, 8))::bit(32)::bigint"
+
+    def render_sql(self, name: str, sql_type: str) -> str:
+        kind, _ = column_kind(sql_type)
+        if kind == "float":
+            return f"floor({name}::float8 * 100)::bigint"
+        if kind == "datetime":
+            return f"to_char({name}, 'YYYY-MM-DD HH24:MI:SS')"
+        return name
+
+    def explain(self, cur, sql: str, params: tuple) -> tuple[list[str], set[str]]:
+        cur.execute(f"EXPLAIN {sql}", params)
+        lines = [row[0] for row in cur.fetchall()]
+        scanned = set()
+        for line in lines:
+            for match in SEQ_SCAN_RE.finditer(line):
+                scanned.update(name for name in match.groups() if name)
+        return lines, scanned
+
+    def inserted_ids(self, cur, rows: int) -> range:
+        # COPY draws the SERIAL values from the table's sequence in row order.
+        cur.execute("SELECT lastval()")
+        (last,) = cur.fetchone()
+        return range(last - rows + 1, last + 1)
+
+    def bulk_insert(
+        self,
+        conn,
+        cur,
+        table: str,
+        columns: tuple[str, ...],
+        batches: Iterable[list[tuple]],
+        stats: TableStats | None = None,
+        ids: list[range] | None = None,
+    ) -> int:
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        rows = 0
+        for batch, generate in timed(batches, stats):
+            began = time.perf_counter()
+            encoded = "".join(tsv_line(row, COPY_ESCAPES) for row in batch)
+            if "\0" in encoded:
+                raise SystemExit(f"{table}: PostgreSQL cannot store NUL characters in text columns")
+            serialized = time.perf_counter()
+            cur.copy_expert(sql, io.StringIO(encoded))
+            if ids is not None:
+                ids.append(self.inserted_ids(cur, len(batch)))
+            executed = time.perf_counter()
+            conn.commit()
+            if stats is not None:
+                stats.record(
+                    len(batch),
+                    generate=generate,
+                    serialize=serialized - began,
+                    execute=executed - serialized,
+                    commit=time.perf_counter() - executed,
+                    nbytes=len(encoded.encode()),
+                )
+            rows += len(batch)
+        return rows
+
+
+BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend, "postgres": PostgresBackend}
+
+
+def get_backend(name: str) -> MySQLBackend:
+    return BACKENDS[name]()
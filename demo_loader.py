@@ -0,0 +1,208 @@
+"""Shared driver of the 3-table demo loaders: customers, their accounts and the accounts' transactions.
+
+``LoadMassiveDemoData`` and ``bank_swapnil_demo`` differ only in their
+``DemoSchema``: table specs, fan-out, Faker locale, CLI defaults and
+messages. Batches are inserted as they are generated, and children take
+their parent ids from the ``inserted_ids`` of the parent batches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import Iterable, Iterator
+
+from counter_rng import stream_key
+from dataset_export import DatasetWriter, SchemaRecorder, add_export_args
+from db_backends import MySQLBackend, add_backend_args, add_connection_args, get_backend
+from load_metrics import LoadMetrics
+from schema_spec import RowPlan, Table, compile_ddl, spec_faker
+
+
+@dataclass(frozen=True)
+class DemoSchema:
+    description: str
+    # customers, accounts and transactions, in that order.
+    tables: tuple[Table, Table, Table]
+    # Faker locale; None is Faker's default (en_US).
+    locale: str | None
+    # Children per parent row, inclusive.
+    accounts_per_customer: tuple[int, int]
+    transactions_per_account: tuple[int, int]
+    # Defaults of --database, --customers and --batch-size.
+    database: str
+    customers: int
+    batch_size: int
+    # Drop and recreate the database on every load, and offer --append.
+    # Without it, missing tables are created and rows are added to existing ones.
+    recreate: bool
+    # Printed before inserting each table, and when done (with {backend} and {database}).
+    labels: tuple[str, str, str]
+    done: str
+
+
+def build_parser(schema: DemoSchema) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=schema.description)
+    add_connection_args(parser, schema.database)
+    parser.add_argument("--customers", type=int, default=schema.customers)
+    parser.add_argument("--batch-size", type=int, default=schema.batch_size)
+    parser.add_argument("--seed", type=int, default=42)
+    if schema.recreate:
+        parser.add_argument(
+            "--append",
+            action="store_true",
+            help="add --customers more customers, with their accounts and transactions, to the "
+            "existing tables instead of recreating the database",
+        )
+    add_export_args(parser)
+    add_backend_args(parser)
+    return parser
+
+
+def check_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> argparse.Namespace:
+    if getattr(args, "append", False) and args.output_dir:
+        parser.error("--append applies to database loads, not --output-dir")
+    return args
+
+
+def chunks(rows: Iterable[tuple], batch_size: int) -> Iterator[list[tuple]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def create_schema(schema: DemoSchema, cursor) -> None:
+    for table in schema.tables:
+        cursor.execute(compile_ddl(table, if_not_exists=not schema.recreate))
+
+
+def customer_rows(schema: DemoSchema, fake, args: argparse.Namespace, first: int = 0) -> Iterator[tuple]:
+    plan = RowPlan(schema.tables[0])
+    return (plan.row(fake, random, args, i) for i in range(first, first + args.customers))
+
+
+def account_rows(
+    schema: DemoSchema, fake, args: argparse.Namespace, customer_ids: Iterable[int], first: int = 0
+) -> Iterator[tuple]:
+    low, high = schema.accounts_per_customer
+    return RowPlan(schema.tables[1]).children(fake, random, args, customer_ids, low, high, first)
+
+
+def transaction_rows(
+    schema: DemoSchema, fake, args: argparse.Namespace, account_ids: Iterable[int], first: int = 0
+) -> Iterator[tuple]:
+    low, high = schema.transactions_per_account
+    return RowPlan(schema.tables[2]).children(fake, random, args, account_ids, low, high, first)
+
+
+def prepare_append(schema: DemoSchema, backend: MySQLBackend, cursor) -> dict[str, int]:
+    """Highest existing id per table, with every table set to continue after it.
+
+    Rows are numbered from there, so unique id and account numbers do not
+    repeat the existing ones.
+    """
+    existing = {}
+    for table in schema.tables:
+        rows, existing[table.name] = backend.table_extent(cursor, table.name, table.primary_key)
+        backend.continue_ids(cursor, table.name, table.primary_key, existing[table.name])
+        print(f"{table.name}: {rows:,} existing rows")
+    return existing
+
+
+def export_dataset(schema: DemoSchema, args: argparse.Namespace, fake) -> None:
+    """Write the schema and data to ``--output-dir``; ids are numbered from 1 as in a new database."""
+    customers, accounts, transactions = schema.tables
+    writer = DatasetWriter(
+        args.output_dir,
+        args.database,
+        args.export_format,
+        args.compression,
+        args.chunk_mb * 1024 * 1024,
+    )
+    recorder = SchemaRecorder()
+    for table in reversed(schema.tables):
+        recorder.execute(f"DROP TABLE IF EXISTS {table.name}")
+    create_schema(schema, recorder)
+    writer.write_schema(recorder.statements)
+
+    batches = chunks(customer_rows(schema, fake, args), args.batch_size)
+    n_customers = writer.write_table("customers", "id", customers.insert_columns, batches)
+    batches = chunks(account_rows(schema, fake, args, range(1, n_customers + 1)), args.batch_size)
+    n_accounts = writer.write_table("accounts", "id", accounts.insert_columns, batches)
+    batches = chunks(transaction_rows(schema, fake, args, range(1, n_accounts + 1)), args.batch_size)
+    writer.write_table("transactions", "id", transactions.insert_columns, batches)
+    writer.close()
+    print(f"✅ Dataset written to {args.output_dir}")
+
+
+def load_demo(schema: DemoSchema, args: argparse.Namespace) -> dict:
+    """Load (or export) the demo dataset; returns the load report."""
+    from faker import Faker
+
+    random.seed(args.seed)
+    fake = spec_faker(schema.locale, schema.tables)
+    Faker.seed(args.seed)
+    metrics = LoadMetrics()
+
+    if args.output_dir:
+        export_dataset(schema, args, fake)
+        return metrics.report()
+
+    customers, accounts, transactions = schema.tables
+    append = getattr(args, "append", False)
+    backend = get_backend(args.backend)
+    conn = backend.connect(args)
+    cursor = conn.cursor()
+
+    try:
+        backend.use_database(cursor, args.database, recreate=schema.recreate and not append)
+        existing = dict.fromkeys((table.name for table in schema.tables), 0)
+        if append:
+            existing = prepare_append(schema, backend, cursor)
+            if any(existing.values()):
+                # A new seed per growth step, so appended rows do not replay the first run.
+                seed = stream_key(args.seed, "append", *existing.values())
+                random.seed(seed)
+                fake.seed_instance(seed)
+        else:
+            recorder = SchemaRecorder()
+            create_schema(schema, recorder)
+            backend.create_schema(cursor, recorder.statements)
+        conn.commit()
+
+        print(schema.labels[0])
+        batches = chunks(customer_rows(schema, fake, args, existing["customers"]), args.batch_size)
+        customer_ids: list[range] = []
+        backend.bulk_insert(
+            conn, cursor, "customers", customers.insert_columns, batches, metrics.table("customers"), customer_ids
+        )
+
+        print(schema.labels[1])
+        batches = chunks(
+            account_rows(schema, fake, args, chain.from_iterable(customer_ids), existing["accounts"]),
+            args.batch_size,
+        )
+        account_ids: list[range] = []
+        backend.bulk_insert(
+            conn, cursor, "accounts", accounts.insert_columns, batches, metrics.table("accounts"), account_ids
+        )
+
+        print(schema.labels[2])
+        batches = chunks(
+            transaction_rows(schema, fake, args, chain.from_iterable(account_ids), existing["transactions"]),
+            args.batch_size,
+        )
+        backend.bulk_insert(
+            conn, cursor, "transactions", transactions.insert_columns, batches, metrics.table("transactions")
+        )
+
+        print(schema.done.format(backend=backend.name, database=args.database))
+    except backend.errors as exc:
+        conn.rollback()
+        raise SystemExit(f"Database error: {exc}") from exc
+    finally:
+        cursor.close()
+        conn.close()
+    return metrics.report()
@@ -0,0 +1,120 @@
+"""Checkpoint journal behind ``--resume``.
+
+The journal is a small JSON file, rewritten atomically after every commit.
+For each table part (a whole table, or one ``--split`` row range of it) it
+records how many rows are committed and whether the part is finished. A
+single-stream load also stores the generator state at its last checkpoint,
+so a restart continues the random streams from there instead of
+regenerating every earlier row.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Callable, Iterable, Iterator
+
+
+def as_tuples(value):
+    """Undo JSON's tuple-to-list conversion (``random.Random.setstate`` wants tuples)."""
+    if isinstance(value, list):
+        return tuple(as_tuples(item) for item in value)
+    return value
+
+
+class LoadJournal:
+    def __init__(self, path: str, fingerprint: dict, data: dict | None = None) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.resumed = data is not None
+        self.data = data or {"fingerprint": fingerprint, "parts": {}, "state": None}
+
+    @classmethod
+    def open(cls, path: str, fingerprint: dict) -> LoadJournal:
+        """Continue the journal at ``path`` if it exists, otherwise start a new one."""
+        if not os.path.exists(path):
+            return cls(path, fingerprint)
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        if data.get("fingerprint") != fingerprint:
+            raise SystemExit(
+                f"{path} was written by a load with different options; "
+                "rerun with the same options or delete it to start over"
+            )
+        return cls(path, fingerprint, data)
+
+    @staticmethod
+    def key(table: str, first_row: int) -> str:
+        return f"{table}:{first_row}"
+
+    def rows(self, table: str, first_row: int = 0) -> int:
+        """Rows committed in the part that starts after row ``first_row``."""
+        return self.data["parts"].get(self.key(table, first_row), {}).get("rows", 0)
+
+    def done(self, table: str, first_row: int = 0) -> bool:
+        return self.data["parts"].get(self.key(table, first_row), {}).get("done", False)
+
+    def state(self):
+        """Generator state saved with the latest checkpoint, or None."""
+        return as_tuples(self.data["state"])
+
+    def checkpoint(self, table: str, first_row: int, rows: int, done: bool = False, state=None) -> None:
+        with self.lock:
+            self.data["parts"][self.key(table, first_row)] = {"rows": rows, "done": done}
+            if state is not None:
+                self.data["state"] = state
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as handle:
+                json.dump(self.data, handle)
+            os.replace(tmp, self.path)
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class PartProgress:
+    """Journal one table part as its batches commit.
+
+    ``track`` notes every generated batch boundary, with the generator state
+    from ``capture`` if given. ``committed`` then checkpoints the last
+    boundary that is fully committed. A batch re-chunked by the adaptive
+    batcher is therefore never recorded half done; rows past the checkpoint
+    are deleted and regenerated on resume.
+    """
+
+    def __init__(
+        self,
+        journal: LoadJournal,
+        table: str,
+        first_row: int,
+        rows: int = 0,
+        capture: Callable[[], object] | None = None,
+    ) -> None:
+        self.journal = journal
+        self.table = table
+        self.first_row = first_row
+        self.capture = capture
+        self.generated = rows
+        self.committed_rows = rows
+        self.boundaries: deque[tuple[int, object]] = deque()
+
+    def track(self, batches: Iterable[list[tuple]]) -> Iterator[list[tuple]]:
+        for batch in batches:
+            self.generated += len(batch)
+            self.boundaries.append((self.generated, self.capture() if self.capture else None))
+            yield batch
+
+    def committed(self, rows: int) -> None:
+        self.committed_rows += rows
+        last = None
+        while self.boundaries and self.boundaries[0][0] <= self.committed_rows:
+            last = self.boundaries.popleft()
+        if last is not None:
+            self.journal.checkpoint(self.table, self.first_row, last[0], state=last[1])
+
+    def finish(self) -> None:
+        state = self.capture() if self.capture else None
+        self.journal.checkpoint(self.table, self.first_row, self.generated, done=True, state=state)
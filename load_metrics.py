@@ -0,0 +1,193 @@
+"""Low-overhead load instrumentation: per-table and per-batch phase timings.
+
+Every batch records how long it spent in four phases:
+
+- ``generate``: producing the rows (Faker / NumPy / waiting on worker processes).
+  Under ``--pipeline`` it is the time the writer waited on the producer's queue.
+- ``serialize``: encoding rows client-side where the loader does it itself
+  (TSV for LOAD DATA / COPY). For ``executemany`` the connector builds the
+  statement inside the call, so that time is part of ``execute``.
+- ``execute``: sending the batch and waiting for the server.
+- ``commit``: ``conn.commit()``.
+
+Only ``time.perf_counter`` calls and a few integer additions happen per
+batch, so the collector stays on for every run. ``write_report`` dumps a JSON
+summary; an optional live file in Prometheus text format is rewritten at most
+every ``live_interval`` seconds for scraping during long runs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+PHASES = ("generate", "serialize", "execute", "commit")
+
+
+def add_metrics_args(parser) -> None:
+    parser.add_argument("--report", metavar="PATH", help="write a JSON load report here when done")
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="keep Prometheus-format live counters in this file during the load",
+    )
+    parser.add_argument(
+        "--metrics-interval", type=float, default=5.0, help="seconds between --metrics-file rewrites"
+    )
+
+
+def peak_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class TableStats:
+    """Counters for one table; shared by every part loading that table."""
+
+    def __init__(self, name: str, metrics: LoadMetrics) -> None:
+        self.name = name
+        self.metrics = metrics
+        self.rows = 0
+        self.bytes = 0
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.batches: list[tuple] = []
+        self.first_start: float | None = None
+        self.last_end: float | None = None
+        self.notes: dict[str, list] = {}
+
+    def timed(self, batches: Iterable[list[tuple]]) -> Iterator[tuple[list[tuple], float]]:
+        """Yield ``(batch, seconds spent producing it)``."""
+        iterator = iter(batches)
+        while True:
+            began = time.perf_counter()
+            batch = next(iterator, None)
+            if batch is None:
+                return
+            yield batch, time.perf_counter() - began
+
+    def record(
+        self,
+        rows: int,
+        generate: float = 0.0,
+        serialize: float = 0.0,
+        execute: float = 0.0,
+        commit: float = 0.0,
+        nbytes: int = 0,
+    ) -> None:
+        end = time.perf_counter()
+        start = end - generate - serialize - execute - commit
+        with self.metrics.lock:
+            self.rows += rows
+            self.bytes += nbytes
+            timings = (generate, serialize, execute, commit)
+            for phase, seconds in zip(PHASES, timings):
+                self.seconds[phase] += seconds
+            self.batches.append((rows, *timings, nbytes))
+            if self.first_start is None or start < self.first_start:
+                self.first_start = start
+            self.last_end = end
+        self.metrics.maybe_write_live()
+
+    def note(self, key: str, value: dict) -> None:
+        """Attach a decision made while loading (one per loaded part) to the report."""
+        with self.metrics.lock:
+            self.notes.setdefault(key, []).append(value)
+
+    def batch_count(self) -> int:
+        # Entries with no rows are table-level commits or LOAD DATA flushes.
+        return sum(1 for entry in self.batches if entry[0])
+
+    def summary(self) -> dict:
+        wall = (self.last_end - self.first_start) if self.batches else 0.0
+        summary = {
+            "rows": self.rows,
+            "batches": self.batch_count(),
+            "bytes": self.bytes,
+            "seconds": {phase: round(value, 6) for phase, value in self.seconds.items()},
+            "wall_seconds": round(wall, 6),
+            "rows_per_s": self.rows / wall if wall else None,
+            "batch_timings": {
+                "fields": ["rows", *PHASES, "bytes"],
+                "values": [[round(v, 6) if isinstance(v, float) else v for v in b] for b in self.batches],
+            },
+        }
+        summary.update(self.notes)
+        return summary
+
+
+class LoadMetrics:
+    def __init__(self, live_path: str | None = None, live_interval: float = 5.0) -> None:
+        self.lock = threading.Lock()
+        self.tables: dict[str, TableStats] = {}
+        self.started = datetime.now(timezone.utc)
+        self.clock_start = time.perf_counter()
+        self.live_path = live_path
+        self.live_interval = live_interval
+        self._next_live = 0.0
+
+    def table(self, name: str) -> TableStats:
+        with self.lock:
+            if name not in self.tables:
+                self.tables[name] = TableStats(name, self)
+            return self.tables[name]
+
+    def notes(self, key: str) -> dict[str, list]:
+        """``TableStats.note`` values under ``key``, by table."""
+        return {name: stats.notes[key] for name, stats in self.tables.items() if key in stats.notes}
+
+    def maybe_write_live(self, force: bool = False) -> None:
+        if not self.live_path:
+            return
+        now = time.perf_counter()
+        with self.lock:
+            # Writer threads race here; only the one that claims the interval writes.
+            if not force and now < self._next_live:
+                return
+            self._next_live = now + self.live_interval
+        lines = []
+        with self.lock:
+            for name, stats in self.tables.items():
+                label = f'table="{name}"'
+                lines.append(f"loader_rows_total{{{label}}} {stats.rows}")
+                lines.append(f"loader_bytes_total{{{label}}} {stats.bytes}")
+                lines.append(f"loader_batches_total{{{label}}} {stats.batch_count()}")
+                for phase, seconds in stats.seconds.items():
+                    lines.append(f'loader_phase_seconds_total{{{label},phase="{phase}"}} {seconds:.6f}')
+        lines.append(f"loader_elapsed_seconds {now - self.clock_start:.3f}")
+        rss = peak_rss_bytes()
+        if rss is not None:
+            lines.append(f"loader_peak_rss_bytes {rss}")
+        # A temporary file per thread, so a forced write never replaces another thread's file.
+        tmp = f"{self.live_path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.live_path)
+
+    def report(self) -> dict:
+        elapsed = time.perf_counter() - self.clock_start
+        rows = sum(stats.rows for stats in self.tables.values())
+        rss = peak_rss_bytes()
+        return {
+            "started": self.started.isoformat(),
+            "finished": datetime.now(timezone.utc).isoformat(),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows": rows,
+            "rows_per_s": rows / elapsed if elapsed else None,
+            "bytes": sum(stats.bytes for stats in self.tables.values()),
+            "peak_rss_mb": round(rss / 1024 / 1024, 1) if rss is not None else None,
+            "tables": {name: stats.summary() for name, stats in self.tables.items()},
+        }
+
+    def write_report(self, path: str) -> None:
+        self.maybe_write_live(force=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.report(), handle, indent=2)
@@ -0,0 +1,93 @@
+"""Overlap row generation with inserts through a bounded queue.
+
+Without this a load alternates: Faker runs while the server sits idle, then
+the server works while Python waits for it. ``prefetch`` moves the batch
+iterator onto a producer thread that stays at most ``depth`` batches ahead
+of the writer, so a table takes roughly max(generate, insert) instead of
+their sum:
+
+- The queue is bounded, so a slow writer blocks the producer
+  (backpressure). At most ``depth + 2`` batches are alive: the queued ones,
+  the one being generated and the one being written.
+- An exception in the producer is re-raised in the writer where the batch
+  would have been produced, so the writer's usual rollback runs. If the
+  writer stops early, the producer is told to stop and joined.
+
+Faker holds the GIL, but the database drivers release it while waiting on
+the server, and that wait is what overlaps with generation.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Iterable, Iterator
+
+# Seconds a blocked producer waits before checking whether the writer stopped.
+PUT_POLL_SECONDS = 0.1
+
+
+def progress(iterable: Iterable | None = None, **kwargs):
+    """A ``tqdm`` progress bar; tqdm is imported on first use rather than at startup."""
+    from tqdm import tqdm
+
+    return tqdm(iterable, **kwargs)
+
+
+class _End:
+    def __init__(self, error: BaseException | None = None) -> None:
+        self.error = error
+
+
+def prefetch(
+    batches: Iterable[list[tuple]], depth: int, total: int | None = None, desc: str | None = None
+) -> Iterator[list[tuple]]:
+    """Yield ``batches`` generated on a background thread, at most ``depth`` ahead.
+
+    With ``desc``, a second progress bar ("<desc> generated") tracks the
+    producer next to the writer's own bar.
+    """
+    ready: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    bar = progress(total=total, desc=f"{desc} generated", leave=False) if desc else None
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(batches)
+        try:
+            for batch in iterator:
+                if not put(batch):
+                    return
+                if bar is not None:
+                    bar.update()
+            put(_End())
+        except BaseException as exc:
+            put(_End(exc))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name="batch-producer", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = ready.get()
+            if isinstance(item, _End):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+        if bar is not None:
+            bar.close()
@@ -0,0 +1,303 @@
+"""Read-workload benchmark over a database loaded by the 10-table loader.
+
+Runs a canned, parameterized query mix for ``--duration`` seconds on
+``--concurrency`` connections, each issuing its next query as soon as the
+last one returns (closed loop), and reports throughput and latency
+percentiles per query:
+
+- ``statement``: one account's transactions over a 30-day window.
+- ``branch_deposits`` / ``branch_loans``: branch-level aggregates over
+  accounts and loans.
+- ``top_merchants``: the highest-spend merchants of a city over 90 days.
+- ``customer_360``: a customer with their accounts, cards and loans.
+
+Parameters (ids, dates, cities) are drawn per execution, with ids taken
+from the tables' current ranges. ``--explain`` prints each query's plan
+first. Queries that scan a whole table get the index that would serve
+them suggested.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable
+
+from counter_rng import stream_key
+from db_backends import MySQLBackend, add_backend_args, add_connection_args, get_backend
+from LoadMassiveDataWith10Tabel import CITIES, primary_key
+from pipeline import progress
+from traffic_simulator import WorkerStats, run_connections
+
+if TYPE_CHECKING:
+    from tqdm import tqdm
+
+# Tables whose id ranges the parameters draw from.
+ID_TABLES = ("branches", "customers", "accounts")
+
+# Transactions and card transactions span this many days back from now.
+HISTORY_DAYS = 730
+
+
+@dataclass(frozen=True)
+class Query:
+    name: str
+    # SQL with ``{p}`` for each parameter placeholder.
+    sql: str
+    params: Callable[[random.Random, dict[str, int]], tuple]
+    # (table or alias as the plan names it, table, columns) of an index that serves the query.
+    indexes: tuple[tuple[str, str, tuple[str, ...]], ...] = ()
+
+
+def days_ago(rng: random.Random, days: int) -> datetime:
+    return datetime.now().replace(microsecond=0) - timedelta(seconds=rng.randint(0, days * 86_400))
+
+
+def statement_params(rng: random.Random, ids: dict[str, int]) -> tuple:
+    start = days_ago(rng, HISTORY_DAYS)
+    return rng.randint(1, ids["accounts"]), start, start + timedelta(days=30)
+
+
+QUERIES = (
+    Query(
+        "statement",
+        "SELECT t.txn_id, t.txn_type, t.amount, t.txn_date, t.description FROM transactions t "
+        "WHERE t.account_id = {p} AND t.txn_date >= {p} AND t.txn_date < {p} ORDER BY t.txn_date",
+        statement_params,
+        (("t", "transactions", ("account_id", "txn_date")),),
+    ),
+    Query(
+        "branch_deposits",
+        "SELECT a.account_type, COUNT(*), SUM(a.balance), AVG(a.balance) FROM accounts a "
+        "WHERE a.branch_id = {p} GROUP BY a.account_type",
+        lambda rng, ids: (rng.randint(1, ids["branches"]),),
+        (("a", "accounts", ("branch_id", "account_type", "balance")),),
+    ),
+    Query(
+        "branch_loans",
+        "SELECT l.loan_type, COUNT(*), SUM(l.loan_amount), AVG(l.interest_rate) FROM loans l "
+        "WHERE l.branch_id = {p} GROUP BY l.loan_type",
+        lambda rng, ids: (rng.randint(1, ids["branches"]),),
+        (("l", "loans", ("branch_id", "loan_type")),),
+    ),
+    Query(
+        "top_merchants",
+        "SELECT ct.merchant_name, COUNT(*) AS txns, SUM(ct.amount) AS total FROM card_transactions ct "
+        "WHERE ct.city = {p} AND ct.txn_date >= {p} GROUP BY ct.merchant_name ORDER BY total DESC LIMIT 10",
+        lambda rng, ids: (rng.choice(CITIES), days_ago(rng, 0) - timedelta(days=90)),
+        (("ct", "card_transactions", ("city", "txn_date")),),
+    ),
+    Query(
+        "customer_360",
+        "SELECT c.customer_id, c.full_name, c.city, "
+        "COUNT(DISTINCT a.account_id), COUNT(DISTINCT cd.card_id), COUNT(DISTINCT l.loan_id) "
+        "FROM customers c "
+        "LEFT JOIN accounts a ON a.customer_id = c.customer_id "
+        "LEFT JOIN cards cd ON cd.customer_id = c.customer_id "
+        "LEFT JOIN loans l ON l.customer_id = c.customer_id "
+        "WHERE c.customer_id = {p} GROUP BY c.customer_id, c.full_name, c.city",
+        lambda rng, ids: (rng.randint(1, ids["customers"]),),
+        (
+            ("a", "accounts", ("customer_id",)),
+            ("cd", "cards", ("customer_id",)),
+            ("l", "loans", ("customer_id",)),
+        ),
+    ),
+)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_connection_args(parser, "BankOf420")
+    parser.add_argument(
+        "--queries",
+        default=",".join(query.name for query in QUERIES),
+        help="comma-separated queries to run (default: all)",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="connections running queries at once")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds run before measuring")
+    parser.add_argument("--explain", action="store_true", help="print query plans and index suggestions first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report", metavar="PATH", help="write a JSON report here when done")
+    add_backend_args(parser)
+    args = parser.parse_args(argv)
+
+    known = {query.name: query for query in QUERIES}
+    names = [name for name in args.queries.split(",") if name]
+    unknown = [name for name in names if name not in known]
+    if unknown or not names:
+        parser.error(f"unknown --queries {', '.join(unknown)}; choose from {', '.join(known)}")
+    args.workload = [known[name] for name in names]
+    if args.concurrency < 1 or args.duration <= 0 or args.warmup < 0:
+        parser.error("--concurrency and --duration must be positive and --warmup not negative")
+    return args
+
+
+def id_ranges(backend: MySQLBackend, cur) -> dict[str, int]:
+    ids = {}
+    for table in ID_TABLES:
+        _, ids[table] = backend.table_extent(cur, table, primary_key(table))
+        if not ids[table]:
+            raise SystemExit(f"{table} is empty; load the database with LoadMassiveDataWith10Tabel.py first")
+    return ids
+
+
+def explain_workload(
+    backend: MySQLBackend, cur, workload: list[Query], ids: dict[str, int], rng: random.Random
+) -> list[dict]:
+    """Print each query's plan; returns the indexes suggested for full scans."""
+    suggestions = []
+    for query in workload:
+        lines, scanned = backend.explain(cur, query.sql.format(p=backend.placeholder), query.params(rng, ids))
+        print(f"\n{query.name}:")
+        for line in lines:
+            print(f"  {line}")
+        for alias, table, columns in query.indexes:
+            if alias in scanned or table in scanned:
+                name = f"ix_{table}_{'_'.join(columns)}"
+                suggestion = f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"
+                suggestions.append({"query": query.name, "table": table, "index": suggestion})
+                print(f"  full scan of {table}; suggested: {suggestion}")
+    return suggestions
+
+
+def run_worker(
+    backend: MySQLBackend,
+    conn,
+    cur,
+    args: argparse.Namespace,
+    ids: dict[str, int],
+    worker: int,
+    clock: dict[str, float],
+    stop: threading.Event,
+    bar: tqdm,
+) -> WorkerStats:
+    """Run random queries from the workload back to back until the run ends."""
+    rng = random.Random(stream_key(args.seed, "query-benchmark", worker))
+    sql = {query.name: query.sql.format(p=backend.placeholder) for query in args.workload}
+    stats = WorkerStats()
+    try:
+        while not stop.is_set():
+            began = time.perf_counter()
+            if began >= clock["end"]:
+                break
+            query = rng.choice(args.workload)
+            try:
+                cur.execute(sql[query.name], query.params(rng, ids))
+                cur.fetchall()
+                # Ends the read transaction, so no snapshot outlives its query.
+                conn.commit()
+            except backend.errors as exc:
+                conn.rollback()
+                if began >= clock["measure"]:
+                    stats.fail(query.name, exc)
+                continue
+            if began >= clock["measure"]:
+                stats.histogram(query.name).record(time.perf_counter() - began)
+                bar.update()
+    finally:
+        cur.close()
+        conn.close()
+    return stats
+
+
+def report(args: argparse.Namespace, stats: WorkerStats, elapsed: float, suggestions: list[dict]) -> dict:
+    completed = sum(histogram.count for histogram in stats.latency.values())
+    return {
+        "backend": args.backend,
+        "database": args.database,
+        "concurrency": args.concurrency,
+        "seconds": elapsed,
+        "queries_per_s": completed / elapsed if elapsed else 0.0,
+        "queries": {
+            name: {
+                **stats.histogram(name).summary(),
+                "per_s": stats.histogram(name).count / elapsed if elapsed else 0.0,
+                "errors": stats.errors.get(name, 0),
+            }
+            for name in [query.name for query in args.workload]
+        },
+        "first_errors": stats.first_error,
+        "index_suggestions": suggestions,
+    }
+
+
+def print_report(summary: dict) -> None:
+    print(
+        f"\n{summary['queries_per_s']:,.1f} queries/s over {summary['seconds']:.1f}s "
+        f"on {summary['concurrency']} connections"
+    )
+    print(f"{'query':<18} {'count':>9} {'per s':>9} {'errors':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    for name, row in summary["queries"].items():
+        print(
+            f"{name:<18} {row['count']:>9,} {row['per_s']:>9,.1f} {row['errors']:>7,} "
+            f"{row['p50_ms']:>9.2f} {row['p90_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+        )
+    for name, message in summary["first_errors"].items():
+        print(f"{name}: first error: {message}")
+
+
+def main() -> None:
+    args = parse_args()
+    backend = get_backend(args.backend)
+    conn = backend.connect(args)
+    cur = conn.cursor()
+    try:
+        backend.use_database(cur, args.database)
+        ids = id_ranges(backend, cur)
+        suggestions = []
+        if args.explain:
+            suggestions = explain_workload(backend, cur, args.workload, ids, random.Random(args.seed))
+            conn.commit()
+    except backend.errors as exc:
+        raise SystemExit(f"Database error: {exc}") from exc
+    finally:
+        cur.close()
+        conn.close()
+
+    stop = threading.Event()
+    clock: dict[str, float] = {}
+
+    def start_clock() -> None:
+        clock["measure"] = time.perf_counter() + args.warmup
+        clock["end"] = clock["measure"] + args.duration
+
+    bar = progress(unit="query", desc="queries")
+    try:
+        # Everyone starts together once every connection is open.
+        results = run_connections(
+            backend,
+            args,
+            args.concurrency,
+            "query",
+            start_clock,
+            lambda conn, cur, worker: run_worker(backend, conn, cur, args, ids, worker, clock, stop, bar),
+            stop,
+        )
+    finally:
+        bar.close()
+    if "measure" not in clock:
+        return
+    finished = time.perf_counter()
+    # The measured window ends at its deadline unless the run was cut short.
+    elapsed = max(0.0, (finished if stop.is_set() else max(finished, clock["end"])) - clock["measure"])
+
+    stats = WorkerStats()
+    for result in results:
+        stats.merge(result)
+    summary = report(args, stats, elapsed, suggestions)
+    print_report(summary)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            json.dump(summary, handle, indent=2)
+        print(f"Benchmark report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Restore a dataset written with ``--output-dir`` into MySQL, loading chunks in parallel."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from dataset_export import CSV_NULL, MANIFEST, open_compressed
+from db_backends import add_connection_args
+from pipeline import progress
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input_dir")
+    add_connection_args(parser, None, "defaults to the database recorded in the manifest")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent connections")
+    parser.add_argument("--batch-size", type=int, default=2_000, help="rows per CSV insert")
+    return parser.parse_args()
+
+
+def split_statements(text: str) -> list[str]:
+    # Chunk and schema files end every statement with ";\n"; string literals
+    # never contain a raw newline because the exporter escapes them.
+    return [stmt for stmt in (part.strip() for part in text.split(";\n")) if stmt]
+
+
+def restore_chunk(
+    args: argparse.Namespace, database: str, manifest: dict, table: dict, chunk: str
+) -> int:
+    """Load one chunk file on its own connection and commit it."""
+    import mysql.connector
+
+    conn = mysql.connector.connect(
+        host=args.host, user=args.user, password=args.password, database=database
+    )
+    cur = conn.cursor()
+    path = os.path.join(args.input_dir, chunk)
+    rows = 0
+    try:
+        # Chunks of parent and child tables load concurrently, so the keys are
+        # only consistent once every chunk is in.
+        cur.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+        with open_compressed(path, manifest["compression"], "r") as handle:
+            if manifest["format"] == "sql":
+                for statement in split_statements(handle.read()):
+                    cur.execute(statement)
+                    rows += cur.rowcount
+            else:
+                columns = table["columns"]
+                sql = (
+                    f"INSERT INTO {table['name']} ({', '.join(columns)}) "
+                    f"VALUES ({','.join(['%s'] * len(columns))})"
+                )
+                batch: list[list] = []
+                for record in csv.reader(handle):
+                    batch.append([None if value == CSV_NULL else value for value in record])
+                    if len(batch) >= args.batch_size:
+                        cur.executemany(sql, batch)
+                        rows += len(batch)
+                        batch.clear()
+                if batch:
+                    cur.executemany(sql, batch)
+                    rows += len(batch)
+        conn.commit()
+        return rows
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+
+def main() -> None:
+    import mysql.connector
+
+    args = parse_args()
+    with open(os.path.join(args.input_dir, MANIFEST), encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    database = args.database or manifest["database"]
+
+    conn = mysql.connector.connect(host=args.host, user=args.user, password=args.password)
+    cur = conn.cursor()
+    try:
+        cur.execute(f"CREATE DATABASE IF NOT EXISTS {database}")
+        cur.execute(f"USE {database}")
+        with open(os.path.join(args.input_dir, manifest["schema"]), encoding="utf-8") as handle:
+            for statement in split_statements(handle.read()):
+                cur.execute(statement)
+        conn.commit()
+
+        jobs = [(table, chunk) for table in manifest["tables"] for chunk in table["chunks"]]
+        total_rows = sum(table["rows"] for table in manifest["tables"])
+        with ThreadPoolExecutor(max_workers=args.workers) as pool, progress(
+            total=total_rows, desc="restore"
+        ) as bar:
+            futures = [
+                pool.submit(restore_chunk, args, database, manifest, table, chunk)
+                for table, chunk in jobs
+            ]
+            for future in futures:
+                bar.update(future.result())
+
+        print(f"✅ Restored {total_rows} rows into '{database}' from {args.input_dir}")
+    except mysql.connector.Error as exc:
+        conn.rollback()
+        raise SystemExit(f"Database error: {exc}") from exc
+    finally:
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
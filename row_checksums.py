@@ -0,0 +1,176 @@
+"""Order-independent row checksums, computed alike in Python and on the server.
+
+A row hashes to a 32-bit value of its columns rendered as text and joined
+with ``|``, as the server's ``CONCAT_WS('|', ...)`` prints them: DECIMAL
+with its scale, DATE as ``YYYY-MM-DD``, DATETIME as ``YYYY-MM-DD HH:MM:SS``
+and FLOAT as ``FLOOR(value * 100)``. Values are taken as the backend stores
+them (``float32`` and ``rounds_seconds`` on the backend). Each backend
+supplies the hash function and its SQL twin (``row_hash`` and
+``row_hash_sql`` in ``db_backends``).
+
+A range of rows checksums to its row count and the sum of its row hashes.
+Sums add up, so rows may arrive in any order and the checksum of a range
+is the sum of its parts. ``ChecksumManifest`` keeps one such pair per
+``CHUNK_ROWS`` ids of every table; ``verify_load.py`` compares them with
+the same sums queried per id range.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import struct
+import threading
+from datetime import timedelta
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Sequence
+
+if TYPE_CHECKING:
+    from db_backends import MySQLBackend
+    from schema_spec import Table
+
+# Ids per manifest chunk, the smallest range checksummed without reading rows.
+# Equal to the loader's SHARD_ROWS, so a chunk is one shard.
+CHUNK_ROWS = 10_000
+
+MANIFEST_VERSION = 1
+
+
+def column_kind(sql_type: str) -> tuple[str, int]:
+    """``(kind, scale)`` of a MySQL column type; kind is int, decimal, float, date, datetime or text."""
+    name, _, rest = sql_type.upper().partition("(")
+    name = name.split()[0]
+    if name in ("INT", "BIGINT"):
+        return "int", 0
+    if name == "DECIMAL":
+        return "decimal", int(rest.rstrip(")").partition(",")[2] or 0)
+    if name in ("FLOAT", "DATE", "DATETIME"):
+        return name.lower(), 0
+    return "text", 0
+
+
+def single(value: float) -> float:
+    """``value`` rounded to single precision, as a FLOAT column stores it."""
+    return struct.unpack("f", struct.pack("f", value))[0]
+
+
+def renderer(sql_type: str, backend: MySQLBackend) -> Callable[[object], str]:
+    """Function printing a generated value as ``backend`` prints the stored one."""
+    kind, scale = column_kind(sql_type)
+    if kind == "decimal":
+        return lambda value: f"{value:.{scale}f}"
+    if kind == "float" and backend.float32:
+        return lambda value: str(math.floor(single(value) * 100))
+    if kind == "float":
+        return lambda value: str(math.floor(value * 100))
+    if kind == "date":
+        return lambda value: value.strftime("%Y-%m-%d")
+    if kind == "datetime" and backend.rounds_seconds:
+        return lambda value: (value + timedelta(microseconds=500_000)).strftime("%Y-%m-%d %H:%M:%S")
+    if kind == "datetime":
+        return lambda value: value.strftime("%Y-%m-%d %H:%M:%S")
+    return str
+
+
+class RowHasher:
+    """Hash of a generated row, given its id, over ``columns`` of ``table``."""
+
+    def __init__(self, table: Table, columns: Sequence[str], backend: MySQLBackend) -> None:
+        names = (table.primary_key, *table.insert_columns)
+        types = {column.name: column.sql_type for column in table.columns}
+        self.positions = [names.index(column) for column in columns]
+        self.renderers = [renderer(types[column], backend) for column in columns]
+        self.hash = backend.row_hash
+
+    def __call__(self, row_id: int, row: tuple) -> int:
+        values = (row_id, *row)
+        return self.hash("|".join(render(values[i]) for i, render in zip(self.positions, self.renderers)))
+
+
+class ChecksumManifest:
+    """``[rows, hash sum]`` per ``CHUNK_ROWS`` ids of every table, filled as rows are generated.
+
+    Ids are assumed to run from 1 without gaps, as in a fresh load. ``add``
+    may be called from several threads at once.
+    """
+
+    def __init__(
+        self, backend: MySQLBackend, tables: Iterable[Table], columns: dict[str, list[str]] | None = None
+    ) -> None:
+        self.backend = backend.name
+        self.specs = {table.name: table for table in tables}
+        self.columns = columns or {
+            name: [column.name for column in table.columns] for name, table in self.specs.items()
+        }
+        self.hashers = {name: RowHasher(self.specs[name], cols, backend) for name, cols in self.columns.items()}
+        self.chunks: dict[str, dict[int, list[int]]] = {name: {} for name in self.columns}
+        self._lock = threading.Lock()
+
+    def add(self, table: str, first_id: int, rows: list[tuple]) -> None:
+        """Count ``rows``, whose ids run from ``first_id``."""
+        hasher = self.hashers[table]
+        sums: dict[int, list[int]] = {}
+        for row_id, row in enumerate(rows, first_id):
+            chunk = sums.setdefault((row_id - 1) // CHUNK_ROWS, [0, 0])
+            chunk[0] += 1
+            chunk[1] += hasher(row_id, row)
+        with self._lock:
+            chunks = self.chunks[table]
+            for index, (count, total) in sums.items():
+                chunk = chunks.setdefault(index, [0, 0])
+                chunk[0] += count
+                chunk[1] += total
+
+    def track(self, table: str, batches: Iterable[list[tuple]], first_id: int) -> Iterator[list[tuple]]:
+        """Pass ``batches`` through, adding their rows (ids from ``first_id``)."""
+        for batch in batches:
+            self.add(table, first_id, batch)
+            first_id += len(batch)
+            yield batch
+
+    def rows(self, table: str) -> int:
+        return sum(count for count, _ in self.chunks[table].values())
+
+    def chunk_count(self, table: str) -> int:
+        return max(self.chunks[table], default=-1) + 1
+
+    def expected(self, table: str, chunks: range) -> tuple[int, int]:
+        """Rows and hash sum of ``chunks``."""
+        counts = [self.chunks[table].get(index, (0, 0)) for index in chunks]
+        return sum(count for count, _ in counts), sum(total for _, total in counts)
+
+    def save(self, path: str, fingerprint: dict) -> None:
+        tables = {
+            table: {
+                "columns": self.columns[table],
+                "rows": self.rows(table),
+                "chunks": [self.chunks[table].get(index, [0, 0]) for index in range(self.chunk_count(table))],
+            }
+            for table in self.columns
+        }
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "backend": self.backend,
+            "chunk_rows": CHUNK_ROWS,
+            "fingerprint": fingerprint,
+            "tables": tables,
+        }
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=1)
+
+    @classmethod
+    def load(cls, path: str, backend: MySQLBackend, tables: Iterable[Table]) -> ChecksumManifest:
+        try:
+            with open(path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise SystemExit(f"Cannot read manifest {path}: {exc}") from exc
+        if data.get("version") != MANIFEST_VERSION or data.get("chunk_rows") != CHUNK_ROWS:
+            raise SystemExit(f"{path} is not a version {MANIFEST_VERSION} checksum manifest")
+        if data["backend"] != backend.name:
+            raise SystemExit(
+                f"{path} was written by a {data['backend']} load; verify it with --backend {data['backend']}"
+            )
+        manifest = cls(backend, tables, {table: entry["columns"] for table, entry in data["tables"].items()})
+        for table, entry in data["tables"].items():
+            manifest.chunks[table] = {index: chunk for index, chunk in enumerate(entry["chunks"]) if chunk[0]}
+        return manifest
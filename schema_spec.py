@@ -0,0 +1,484 @@
+"""Declarative table specs compiled into DDL, INSERT columns and batch generators.
+
+A ``Table`` lists its ``Column``s in DDL order. Each column has a SQL type,
+optionally a FOREIGN KEY target, and a generator unless the database fills
+it (the AUTO_INCREMENT key). ``compile_ddl`` turns a table into its CREATE
+TABLE statement; ``RowPlan`` turns it into generation code. A plan runs the
+same generators in one of two ways:
+
+- ``rows``: row by row, each column drawing from the table's ``random`` and
+  Faker streams in column order. This is the draw order of the original
+  hand-written row loops, so seeded output is unchanged.
+- ``columns``: column by column over a whole batch, numeric, enum and date
+  columns as single NumPy draws, then zipped into rows (``--vectorized``).
+
+Generators take ``high`` bounds either as numbers or as the name of the
+argparse option holding a row count, so FOREIGN KEY columns draw from the
+parent's id range. When appending, ``args.existing_ids`` maps such options
+to the parent's highest existing id, and the range covers old and new rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import random
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Sequence
+
+from counter_rng import CounterColumns, CounterRandom, stream_key
+from unique_values import card_number, unique_digits, unique_token
+
+if TYPE_CHECKING:
+    import numpy as np
+    from faker import Faker
+
+# Faker provider modules each generator method needs, including the ones its
+# formats draw on (emails are built from person names, ...). Building a Faker
+# from only these is several times faster than loading every provider, and a
+# seeded provider draws the same values either way.
+FAKER_PROVIDERS = {
+    "name": ("person",),
+    "first_name": ("person",),
+    "last_name": ("person",),
+    "email": ("person", "internet", "company"),
+    "company": ("person", "company"),
+    "street_address": ("person", "address"),
+    "address": ("person", "address"),
+    "phone_number": ("phone_number",),
+    "sentence": ("lorem",),
+    "date_between": ("date_time",),
+    "date_time_between": ("date_time",),
+    "date_of_birth": ("date_time",),
+}
+
+
+def faker_providers(tables: Iterable[Table]) -> list[str]:
+    """Provider modules behind every Faker method the generators of ``tables`` call."""
+    methods = {
+        method for table in tables for column in table.columns if column.gen for method in column.gen.faker_methods
+    }
+    unknown = methods - FAKER_PROVIDERS.keys()
+    if unknown:
+        raise KeyError(f"add the Faker providers of {', '.join(sorted(unknown))} to FAKER_PROVIDERS")
+    return sorted({f"faker.providers.{module}" for method in methods for module in FAKER_PROVIDERS[method]})
+
+
+def spec_faker(locale: str | None, tables: Iterable[Table]) -> Faker:
+    """A Faker for ``locale`` loading only the providers ``tables`` need."""
+    from faker import Faker
+
+    return Faker(locale, providers=faker_providers(tables))
+
+
+def batch_rng(rng: random.Random, start: int, stop: int) -> np.random.Generator | CounterColumns:
+    """Derive a NumPy generator for one batch from the table's stdlib stream.
+
+    Under ``--generator counter`` every column is hashed from its row numbers instead.
+    """
+    if isinstance(rng, CounterRandom):
+        return CounterColumns(rng.key, start, stop)
+    import numpy as np
+
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+def fake_column(fake, start: int, stop: int, provider: str, **kwargs) -> list:
+    """One Faker value per row of ``[start, stop)``."""
+    method = getattr(fake, provider)
+    if not isinstance(fake.random, CounterRandom):
+        return [method(**kwargs) for _ in range(start, stop)]
+    values = []
+    for i in range(start, stop):
+        fake.random.at(i)
+        values.append(method(**kwargs))
+    return values
+
+
+def dates_back(gen: np.random.Generator, n: int, days: int) -> list:
+    """``n`` dates between ``days`` ago and today, like ``fake.date_between``."""
+    import numpy as np
+
+    today = np.datetime64(date.today(), "D")
+    return (today - gen.integers(0, days, size=n, endpoint=True)).tolist()
+
+
+def datetimes_back(gen: np.random.Generator, n: int, days: int) -> list:
+    """``n`` datetimes between ``days`` ago and now, like ``fake.date_time_between``."""
+    import numpy as np
+
+    now = np.datetime64(datetime.now(), "s")
+    return (now - gen.integers(0, days * 86_400, size=n, endpoint=True)).tolist()
+
+
+def bound(value: int | str, args: argparse.Namespace) -> int:
+    if not isinstance(value, str):
+        return value
+    return getattr(args, value) + getattr(args, "existing_ids", {}).get(value, 0)
+
+
+class Gen:
+    """Column generator.
+
+    ``row`` returns one value for row ``i`` (0-based, in generation order).
+    ``column`` returns the values of rows ``[start, stop)``,
+    drawing from ``gen``, a NumPy generator or ``CounterColumns``.
+    ``faker_methods`` names the Faker methods either one calls.
+    """
+
+    faker_methods: tuple[str, ...] = ()
+
+    def row(self, fake, rng: random.Random, args: argparse.Namespace, i: int):
+        raise NotImplementedError
+
+    def column(self, fake, gen, args: argparse.Namespace, start: int, stop: int) -> list:
+        raise NotImplementedError(f"{type(self).__name__} has no column-wise form")
+
+
+class Choice(Gen):
+    def __init__(self, options: Sequence) -> None:
+        self.options = list(options)
+
+    def row(self, fake, rng, args, i):
+        return rng.choice(self.options)
+
+    def column(self, fake, gen, args, start, stop):
+        return gen.choice(self.options, size=stop - start).tolist()
+
+
+class RandInt(Gen):
+    """Uniform integer in ``[low, high]``; ``high`` may name a row-count option."""
+
+    def __init__(self, low: int, high: int | str) -> None:
+        self.low = low
+        self.high = high
+
+    def row(self, fake, rng, args, i):
+        return rng.randint(self.low, bound(self.high, args))
+
+    def column(self, fake, gen, args, start, stop):
+        high = bound(self.high, args)
+        return gen.integers(self.low, high, size=stop - start, endpoint=True).tolist()
+
+
+class Uniform(Gen):
+    """Uniform float in ``[low, high]``, rounded to ``digits`` if given."""
+
+    def __init__(self, low: float, high: float, digits: int | None = None) -> None:
+        self.low = low
+        self.high = high
+        self.digits = digits
+
+    def row(self, fake, rng, args, i):
+        value = rng.uniform(self.low, self.high)
+        return value if self.digits is None else round(value, self.digits)
+
+    def column(self, fake, gen, args, start, stop):
+        values = self.low + gen.random(size=stop - start) * (self.high - self.low)
+        if self.digits is not None:
+            values = values.round(self.digits)
+        return values.tolist()
+
+
+class Fake(Gen):
+    """A Faker provider called once per row."""
+
+    def __init__(self, provider: str, **kwargs) -> None:
+        self.provider = provider
+        self.kwargs = kwargs
+        self.faker_methods = (provider,)
+
+    def row(self, fake, rng, args, i):
+        return getattr(fake, self.provider)(**self.kwargs)
+
+    def column(self, fake, gen, args, start, stop):
+        return fake_column(fake, start, stop, self.provider, **self.kwargs)
+
+
+class DateBack(Gen):
+    """Date between ``start`` (a Faker offset such as ``"-5y"``) and today."""
+
+    faker_methods = ("date_between",)
+
+    def __init__(self, start: str, days: int) -> None:
+        self.start = start
+        self.days = days
+
+    def row(self, fake, rng, args, i):
+        return fake.date_between(start_date=self.start, end_date="today")
+
+    def column(self, fake, gen, args, start, stop):
+        return dates_back(gen, stop - start, self.days)
+
+
+class DateTimeBack(DateBack):
+    """Datetime between ``start`` and now."""
+
+    faker_methods = ("date_time_between",)
+
+    def row(self, fake, rng, args, i):
+        return fake.date_time_between(start_date=self.start, end_date="now")
+
+    def column(self, fake, gen, args, start, stop):
+        return datetimes_back(gen, stop - start, self.days)
+
+
+class Template(Gen):
+    """``str.format`` of the ``parts`` values; ``{n}`` is the 1-based row number."""
+
+    def __init__(self, template: str, *parts: Gen) -> None:
+        self.template = template
+        self.parts = parts
+        self.faker_methods = tuple(method for part in parts for method in part.faker_methods)
+
+    def row(self, fake, rng, args, i):
+        return self.template.format(*(part.row(fake, rng, args, i) for part in self.parts), n=i + 1)
+
+    def column(self, fake, gen, args, start, stop):
+        columns = [part.column(fake, gen, args, start, stop) for part in self.parts]
+        values = zip(*columns) if columns else [()] * (stop - start)
+        return [self.template.format(*parts, n=i + 1) for i, parts in zip(range(start, stop), values)]
+
+
+class Map(Gen):
+    """``func`` applied to another generator's values."""
+
+    def __init__(self, func: Callable, inner: Gen) -> None:
+        self.func = func
+        self.inner = inner
+        self.faker_methods = inner.faker_methods
+
+    def row(self, fake, rng, args, i):
+        return self.func(self.inner.row(fake, rng, args, i))
+
+    def column(self, fake, gen, args, start, stop):
+        return [self.func(value) for value in self.inner.column(fake, gen, args, start, stop)]
+
+
+class UniqueDigits(Gen):
+    """``digits``-digit numbers, one per row index; ``name`` keys the permutation."""
+
+    def __init__(self, digits: int, name: str) -> None:
+        self.digits = digits
+        self.name = name
+
+    def row(self, fake, rng, args, i):
+        return unique_digits(args.seed, self.name, self.digits, i)
+
+    def column(self, fake, gen, args, start, stop):
+        return [unique_digits(args.seed, self.name, self.digits, i) for i in range(start, stop)]
+
+
+class CardNumber(Gen):
+    """Luhn-valid 16-digit card numbers, one per row index."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def row(self, fake, rng, args, i):
+        return card_number(args.seed, self.name, i)
+
+    def column(self, fake, gen, args, start, stop):
+        return [card_number(args.seed, self.name, i) for i in range(start, stop)]
+
+
+class UniqueEmail(Gen):
+    """Faker emails with a per-row unique token appended to the local part."""
+
+    faker_methods = ("email",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def _unique(self, email: str, args: argparse.Namespace, i: int) -> str:
+        local, _, domain = email.partition("@")
+        return f"{local}.{unique_token(args.seed, self.name, i)}@{domain}"
+
+    def row(self, fake, rng, args, i):
+        return self._unique(fake.email(), args, i)
+
+    def column(self, fake, gen, args, start, stop):
+        emails = fake_column(fake, start, stop, "email")
+        return [self._unique(email, args, i) for email, i in zip(emails, range(start, stop))]
+
+
+class Parent(Gen):
+    """The parent row id of a fan-out child, filled in by ``RowPlan.children``."""
+
+    def row(self, fake, rng, args, i):
+        raise TypeError("Parent columns are only generated through RowPlan.children")
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    sql_type: str
+    gen: Gen | None = None
+    # "parent_table(parent_column)" for a FOREIGN KEY.
+    references: str | None = None
+
+
+@dataclass(frozen=True)
+class Table:
+    name: str
+    columns: tuple[Column, ...]
+
+    @property
+    def primary_key(self) -> str:
+        return next(column.name for column in self.columns if "PRIMARY KEY" in column.sql_type)
+
+    @property
+    def insert_columns(self) -> tuple[str, ...]:
+        return tuple(column.name for column in self.columns if column.gen is not None)
+
+    def foreign_keys(self) -> list[tuple[str, str, str]]:
+        """``(column, parent table, parent column)`` for each FOREIGN KEY, in column order."""
+        keys = []
+        for column in self.columns:
+            if column.references:
+                parent, _, parent_column = column.references.rstrip(")").partition("(")
+                keys.append((column.name, parent, parent_column))
+        return keys
+
+
+def next_month(day: date) -> date:
+    return date(day.year + 1, 1, 1) if day.month == 12 else date(day.year, day.month + 1, 1)
+
+
+def month_starts(first: date, last: date) -> list[date]:
+    """First day of every month from ``first``'s through ``last``'s."""
+    months = [date(first.year, first.month, 1)]
+    while next_month(months[-1]) <= last:
+        months.append(next_month(months[-1]))
+    return months
+
+
+@dataclass(frozen=True)
+class MonthlyPartitions:
+    """RANGE COLUMNS partitioning of a date column, one partition per calendar month.
+
+    Months run from ``first``'s through ``last``'s. Older values fall into
+    the first partition and later ones into a trailing ``pmax``.
+    """
+
+    column: str
+    first: date
+    last: date
+
+    @functools.cached_property
+    def months(self) -> list[date]:
+        return month_starts(self.first, self.last)
+
+    @functools.cached_property
+    def names(self) -> list[str]:
+        return [f"p{month:%Y%m}" for month in self.months] + ["pmax"]
+
+    def index(self, value: date) -> int:
+        """Position in ``names`` of the partition holding ``value``."""
+        offset = (value.year - self.first.year) * 12 + value.month - self.first.month
+        return min(max(offset, 0), len(self.months))
+
+    def clause(self) -> str:
+        upper = [next_month(month) for month in self.months]
+        parts = [
+            f"PARTITION {name} VALUES LESS THAN ('{bound:%Y-%m-%d}')" for name, bound in zip(self.names, upper)
+        ]
+        parts.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+        body = ",\n    ".join(parts)
+        return f"PARTITION BY RANGE COLUMNS({self.column}) (\n    {body}\n)"
+
+
+def compile_ddl(
+    table: Table,
+    foreign_keys: bool = True,
+    if_not_exists: bool = False,
+    partitions: MonthlyPartitions | None = None,
+) -> str:
+    """CREATE TABLE for ``table``, partitioned by month when ``partitions`` is given.
+
+    MySQL requires the partitioning column in every unique key and allows no
+    foreign keys on partitioned tables. The primary key of a partitioned
+    table therefore becomes ``(id, column)`` and its FOREIGN KEYs are left out.
+    """
+    lines = []
+    for column in table.columns:
+        sql_type = column.sql_type
+        if partitions is not None:
+            sql_type = sql_type.replace(" PRIMARY KEY", "")
+        lines.append(f"{column.name} {sql_type}")
+    if partitions is not None:
+        lines.append(f"PRIMARY KEY ({table.primary_key}, {partitions.column})")
+    elif foreign_keys:
+        lines += [
+            f"FOREIGN KEY ({column}) REFERENCES {parent}({parent_column})"
+            for column, parent, parent_column in table.foreign_keys()
+        ]
+    exists = "IF NOT EXISTS " if if_not_exists else ""
+    body = ",\n    ".join(lines)
+    ddl = f"CREATE TABLE {exists}{table.name} (\n    {body}\n)"
+    return f"{ddl}\n{partitions.clause()}" if partitions is not None else ddl
+
+
+def insert_sql(table: str, columns: tuple[str, ...]) -> str:
+    placeholders = ",".join(["%s"] * len(columns))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+class RowPlan:
+    """Generation code compiled from a ``Table``; ``rows`` and ``columns`` are batch factories."""
+
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        self.columns_spec = tuple(column for column in table.columns if column.gen is not None)
+        self.insert_columns = table.insert_columns
+        self._row_gens = tuple(column.gen.row for column in self.columns_spec)
+
+    def row(self, fake, rng: random.Random, args: argparse.Namespace, i: int) -> tuple:
+        return tuple([gen(fake, rng, args, i) for gen in self._row_gens])
+
+    def rows(self, fake, rng: random.Random, args: argparse.Namespace, start: int, stop: int) -> list[tuple]:
+        """Rows ``[start, stop)`` built one at a time."""
+        row = self.row
+        if not isinstance(rng, CounterRandom):
+            return [row(fake, rng, args, i) for i in range(start, stop)]
+        rows = []
+        for i in range(start, stop):
+            rng.at(i)
+            fake.random.at(i)
+            rows.append(row(fake, rng, args, i))
+        return rows
+
+    def columns(self, fake, rng: random.Random, args: argparse.Namespace, start: int, stop: int) -> list[tuple]:
+        """Rows ``[start, stop)`` filled a column at a time, then zipped."""
+        gen = batch_rng(rng, start, stop)
+        counter = isinstance(rng, CounterRandom)
+        values = []
+        for column in self.columns_spec:
+            if counter:
+                # Faker columns are positioned per row; a key per column keeps
+                # them from replaying each other's draws.
+                fake.random.seed(stream_key(args.seed, self.table.name, column.name))
+            values.append(column.gen.column(fake, gen, args, start, stop))
+        return list(zip(*values))
+
+    def children(
+        self,
+        fake,
+        rng: random.Random,
+        args: argparse.Namespace,
+        parent_ids: Iterable[int],
+        low: int,
+        high: int,
+        first: int = 0,
+    ) -> Iterator[tuple]:
+        """Between ``low`` and ``high`` rows per parent id, the count drawn before each parent's rows.
+
+        Children are numbered from ``first`` in the order they are generated.
+        """
+        gens = [None if isinstance(column.gen, Parent) else column.gen.row for column in self.columns_spec]
+        i = first
+        for parent in parent_ids:
+            for _ in range(rng.randint(low, high)):
+                yield tuple([parent if gen is None else gen(fake, rng, args, i) for gen in gens])
+                i += 1
@@ -0,0 +1,425 @@
+"""Sustained-rate live traffic against a loaded 10-table banking database.
+
+After ``LoadMassiveDataWith10Tabel.py`` has seeded the schema, this keeps
+writing ``transactions``, ``card_transactions`` and ``loan_payments`` and
+reading accounts, card activity and loan balances at a fixed target rate:
+
+- The schedule is open-loop. Operation ``k`` is due at ``start + k / tps``.
+  Each connection's thread claims the next slot and waits for its absolute
+  due time, so the offered rate does not drift with latency or timer
+  overshoot. When the database falls behind, operations start late
+  instead of the load quietly dropping.
+- Latency is measured from the due time, so queueing behind a slow server
+  shows up in the percentiles. How late operations started is reported
+  separately as schedule lag.
+- Every operation is one transaction on one of ``--connections`` pooled
+  connections, picked by ``--read-ratio`` and the ``--write-mix`` weights.
+  New rows come from the loader's table specs, with foreign keys drawn
+  from the ids already in the database.
+
+Latencies go into per-thread histograms, merged for the p50/p99 report.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+from counter_rng import stream_key
+from db_backends import MySQLBackend, add_backend_args, add_connection_args, get_backend
+from latency_histogram import LatencyHistogram
+from LoadMassiveDataWith10Tabel import SPECS
+from pipeline import progress
+from schema_spec import RowPlan, spec_faker
+
+if TYPE_CHECKING:
+    from faker import Faker
+    from tqdm import tqdm
+
+WRITE_TABLES = ("transactions", "card_transactions", "loan_payments")
+
+# Parent tables whose ids the writes and reads draw, with their keys.
+PARENTS = {"accounts": "account_id", "cards": "card_id", "loans": "loan_id"}
+
+# Read operations: SQL with a ``{p}`` placeholder and the parent table of its id.
+READS: dict[str, tuple[str, str]] = {
+    "account_balance": ("SELECT balance FROM accounts WHERE account_id = {p}", "accounts"),
+    "account_history": (
+        "SELECT txn_id, txn_type, amount, txn_date FROM transactions "
+        "WHERE account_id = {p} ORDER BY txn_date DESC LIMIT 10",
+        "accounts",
+    ),
+    "card_activity": (
+        "SELECT card_txn_id, amount, merchant_name FROM card_transactions "
+        "WHERE card_id = {p} ORDER BY txn_date DESC LIMIT 10",
+        "cards",
+    ),
+    "loan_repaid": ("SELECT COALESCE(SUM(payment_amount), 0) FROM loan_payments WHERE loan_id = {p}", "loans"),
+}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_connection_args(parser, "BankOf420")
+    rate = parser.add_mutually_exclusive_group()
+    rate.add_argument("--tps", type=float, default=100.0, help="target operations (transactions) per second")
+    rate.add_argument(
+        "--rows-per-second",
+        type=float,
+        help="target rows written per second instead of --tps, given --read-ratio and --rows-per-write",
+    )
+    parser.add_argument("--rows-per-write", type=int, default=1, help="rows inserted per write transaction")
+    parser.add_argument("--read-ratio", type=float, default=0.5, help="fraction of operations that are reads")
+    parser.add_argument(
+        "--write-mix",
+        default="transactions=6,card_transactions=3,loan_payments=1",
+        metavar="TABLE=WEIGHT,...",
+        help="relative share of each table among the writes",
+    )
+    parser.add_argument("--connections", type=int, default=8, help="pooled connections, one thread each")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report", metavar="PATH", help="write a JSON latency report here when done")
+    add_backend_args(parser)
+    args = parser.parse_args(argv)
+
+    if not 0 <= args.read_ratio <= 1:
+        parser.error("--read-ratio must be between 0 and 1")
+    if args.rows_per_write < 1 or args.connections < 1 or args.duration <= 0:
+        parser.error("--rows-per-write, --connections and --duration must be positive")
+    args.write_weights = {}
+    for spec in args.write_mix.split(","):
+        table, _, weight = spec.partition("=")
+        if table not in WRITE_TABLES or not weight.isdigit():
+            parser.error(f"invalid --write-mix entry {spec!r}; tables are {', '.join(WRITE_TABLES)}")
+        args.write_weights[table] = int(weight)
+    if args.read_ratio < 1 and not any(args.write_weights.values()):
+        parser.error("--write-mix needs a positive weight when --read-ratio is below 1")
+    if args.rows_per_second is not None:
+        if args.read_ratio == 1:
+            parser.error("--rows-per-second needs writes (--read-ratio below 1)")
+        args.tps = args.rows_per_second / (args.rows_per_write * (1 - args.read_ratio))
+    if args.tps <= 0:
+        parser.error("the target rate must be positive")
+    return args
+
+
+class Schedule:
+    """Open-loop schedule of due times, one slot every ``1 / tps`` seconds from ``begin``."""
+
+    def __init__(self, tps: float, duration: float) -> None:
+        self.interval = 1 / tps
+        self.duration = duration
+        self._slots = itertools.count()
+        self._lock = threading.Lock()
+
+    def begin(self) -> None:
+        self.start = time.perf_counter()
+        self.end = self.start + self.duration
+
+    def claim(self) -> tuple[int, float] | None:
+        """Next ``(slot, due time)``, or None once the run is over."""
+        with self._lock:
+            slot = next(self._slots)
+        due = self.start + slot * self.interval
+        return (slot, due) if due < self.end else None
+
+
+class WorkerStats:
+    """Per-thread counters, merged once the threads are done."""
+
+    def __init__(self) -> None:
+        self.latency: dict[str, LatencyHistogram] = {}
+        self.errors: dict[str, int] = {}
+        self.first_error: dict[str, str] = {}
+        self.lag = LatencyHistogram()
+        self.rows = 0
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self.latency.get(name)
+        if histogram is None:
+            histogram = self.latency[name] = LatencyHistogram()
+        return histogram
+
+    def fail(self, name: str, exc: Exception) -> None:
+        self.errors[name] = self.errors.get(name, 0) + 1
+        self.first_error.setdefault(name, str(exc))
+
+    def merge(self, other: WorkerStats) -> WorkerStats:
+        for name, histogram in other.latency.items():
+            self.histogram(name).merge(histogram)
+        for name, count in other.errors.items():
+            self.errors[name] = self.errors.get(name, 0) + count
+        for name, message in other.first_error.items():
+            self.first_error.setdefault(name, message)
+        self.lag.merge(other.lag)
+        self.rows += other.rows
+        return self
+
+
+def parent_bounds(backend: MySQLBackend, cur, args: argparse.Namespace) -> argparse.Namespace:
+    """Highest existing id of every parent table, as the loader's row-count options.
+
+    The table specs' foreign key generators draw from 1 to these.
+    """
+    bounds = argparse.Namespace(seed=args.seed)
+    for table, key in PARENTS.items():
+        _, max_id = backend.table_extent(cur, table, key)
+        if not max_id:
+            raise SystemExit(f"{table} is empty; load the database with LoadMassiveDataWith10Tabel.py first")
+        setattr(bounds, table, max_id)
+    return bounds
+
+
+def make_operations(
+    backend: MySQLBackend,
+    cur,
+    args: argparse.Namespace,
+    bounds: argparse.Namespace,
+    fake: Faker,
+    rng: random.Random,
+) -> dict[str, Callable[[int], int]]:
+    """Operation name -> callable running it for a slot on ``cur``; returns the rows written."""
+    operations: dict[str, Callable[[int], int]] = {}
+
+    def write(table: str) -> Callable[[int], int]:
+        plan = RowPlan(SPECS[table])
+        sql = backend.insert_sql(table, plan.insert_columns)
+
+        def run(slot: int) -> int:
+            cur.executemany(sql, [plan.row(fake, rng, bounds, slot) for _ in range(args.rows_per_write)])
+            return args.rows_per_write
+
+        return run
+
+    def read(sql: str, parent: str) -> Callable[[int], int]:
+        sql = sql.format(p=backend.placeholder)
+        high = getattr(bounds, parent)
+
+        def run(slot: int) -> int:
+            cur.execute(sql, (rng.randint(1, high),))
+            cur.fetchall()
+            return 0
+
+        return run
+
+    for table in WRITE_TABLES:
+        operations[f"write {table}"] = write(table)
+    for name, (sql, parent) in READS.items():
+        operations[f"read {name}"] = read(sql, parent)
+    return operations
+
+
+def run_worker(
+    backend: MySQLBackend,
+    conn,
+    cur,
+    args: argparse.Namespace,
+    bounds: argparse.Namespace,
+    schedule: Schedule,
+    worker: int,
+    stop: threading.Event,
+    bar: tqdm,
+) -> WorkerStats:
+    """Serve schedule slots on one connection until the run ends or ``stop`` is set."""
+    rng = random.Random(stream_key(args.seed, "traffic", worker))
+    fake = spec_faker("en_IN", [SPECS[table] for table in WRITE_TABLES])
+    fake.seed_instance(stream_key(args.seed, "traffic-faker", worker))
+    stats = WorkerStats()
+    operations = make_operations(backend, cur, args, bounds, fake, rng)
+    writes = [f"write {table}" for table in args.write_weights]
+    weights = list(args.write_weights.values())
+    reads = [f"read {name}" for name in READS]
+    try:
+        while not stop.is_set():
+            claimed = schedule.claim()
+            if claimed is None:
+                break
+            slot, due = claimed
+            delay = due - time.perf_counter()
+            if delay > 0 and stop.wait(delay):
+                break
+            began = time.perf_counter()
+            if rng.random() < args.read_ratio:
+                name = rng.choice(reads)
+            else:
+                name = rng.choices(writes, weights)[0]
+            try:
+                rows = operations[name](slot)
+                conn.commit()
+            except backend.errors as exc:
+                conn.rollback()
+                stats.fail(name, exc)
+                continue
+            finally:
+                bar.update()
+            stats.histogram(name).record(time.perf_counter() - due)
+            stats.lag.record(began - due)
+            stats.rows += rows
+    finally:
+        cur.close()
+        conn.close()
+    return stats
+
+
+def run_connections(
+    backend: MySQLBackend,
+    args: argparse.Namespace,
+    count: int,
+    name: str,
+    begin: Callable[[], None],
+    work: Callable[[object, object, int], WorkerStats],
+    stop: threading.Event,
+) -> list[WorkerStats]:
+    """Run ``work(conn, cur, worker)`` on ``count`` threads, each on a connection of its own.
+
+    The threads start together once every connection is open, with
+    ``begin`` run as they are released. Ctrl-C sets ``stop`` and waits for
+    them. The first worker error is re-raised; a database error as ``SystemExit``.
+    """
+    results: list[WorkerStats] = []
+    errors: list[BaseException] = []
+    ready = threading.Barrier(count, action=begin)
+
+    def run(worker: int) -> None:
+        # Each thread opens its own connection; SQLite connections stay on their thread.
+        try:
+            conn = backend.connect(args)
+            cur = conn.cursor()
+            backend.use_database(cur, args.database)
+        except BaseException as exc:
+            errors.append(exc)
+            ready.abort()
+            return
+        try:
+            ready.wait()
+            results.append(work(conn, cur, worker))
+        except threading.BrokenBarrierError:
+            cur.close()
+            conn.close()
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+
+    threads = [
+        threading.Thread(target=run, args=(worker,), name=f"{name}-{worker}", daemon=True) for worker in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.5)
+    except KeyboardInterrupt:
+        print("\nStopping...")
+        stop.set()
+        ready.abort()
+        for thread in threads:
+            thread.join()
+    if errors:
+        error = errors[0]
+        if isinstance(error, backend.errors):
+            raise SystemExit(f"Database error: {error}") from error
+        raise error
+    return results
+
+
+def report(args: argparse.Namespace, stats: WorkerStats, elapsed: float) -> dict:
+    completed = sum(histogram.count for histogram in stats.latency.values())
+    return {
+        "target_tps": args.tps,
+        "achieved_tps": completed / elapsed if elapsed else 0.0,
+        "rows_per_s": stats.rows / elapsed if elapsed else 0.0,
+        "seconds": elapsed,
+        "connections": args.connections,
+        "read_ratio": args.read_ratio,
+        "write_mix": args.write_weights,
+        "rows_per_write": args.rows_per_write,
+        "backend": args.backend,
+        "operations": {
+            name: {**stats.histogram(name).summary(), "errors": stats.errors.get(name, 0)}
+            for name in sorted(set(stats.latency) | set(stats.errors))
+        },
+        "errors": stats.errors,
+        "first_errors": stats.first_error,
+        "schedule_lag": stats.lag.summary(),
+    }
+
+
+def print_report(summary: dict) -> None:
+    print(
+        f"\nTarget {summary['target_tps']:,.1f} ops/s, achieved {summary['achieved_tps']:,.1f} ops/s "
+        f"and {summary['rows_per_s']:,.1f} rows/s over {summary['seconds']:.1f}s "
+        f"on {summary['connections']} connections"
+    )
+    print(f"{'operation':<28} {'count':>9} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, row in summary["operations"].items():
+        print(
+            f"{name:<28} {row['count']:>9,} {row['errors']:>7,} "
+            f"{row['p50_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['max_ms']:>9.2f}"
+        )
+    lag = summary["schedule_lag"]
+    print(
+        f"{'schedule lag':<28} {lag['count']:>9,} {'':>7} "
+        f"{lag['p50_ms']:>9.2f} {lag['p99_ms']:>9.2f} {lag['max_ms']:>9.2f}"
+    )
+    for name, message in summary["first_errors"].items():
+        print(f"{name}: {summary['errors'][name]} errors, first: {message}")
+    if summary["achieved_tps"] < 0.95 * summary["target_tps"]:
+        print("The target rate was not held; add --connections or lower --tps.")
+
+
+def main() -> None:
+    args = parse_args()
+    backend = get_backend(args.backend)
+    conn = backend.connect(args)
+    cur = conn.cursor()
+    try:
+        backend.use_database(cur, args.database)
+        bounds = parent_bounds(backend, cur, args)
+    except backend.errors as exc:
+        raise SystemExit(f"Database error: {exc}") from exc
+    finally:
+        cur.close()
+        conn.close()
+
+    stop = threading.Event()
+    schedule = Schedule(args.tps, args.duration)
+    bar = progress(total=int(args.tps * args.duration), unit="op", desc="traffic")
+    try:
+        # The schedule starts once every connection is open.
+        results = run_connections(
+            backend,
+            args,
+            args.connections,
+            "traffic",
+            schedule.begin,
+            lambda conn, cur, worker: run_worker(backend, conn, cur, args, bounds, schedule, worker, stop, bar),
+            stop,
+        )
+    finally:
+        bar.close()
+    if not hasattr(schedule, "start"):
+        return
+    finished = time.perf_counter()
+    # A completed run covers the whole schedule (or longer, if it fell behind); an interrupted one ends now.
+    elapsed = (finished if stop.is_set() else max(finished, schedule.end)) - schedule.start
+
+    stats = WorkerStats()
+    for result in results:
+        stats.merge(result)
+    summary = report(args, stats, elapsed)
+    print_report(summary)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            json.dump(summary, handle, indent=2)
+        print(f"Latency report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
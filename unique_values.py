@@ -0,0 +1,107 @@
+"""Collision-free unique values: a keyed permutation of row indexes.
+
+``FeistelPermutation`` is a bijection of ``range(size)``, so distinct row
+indexes always map to distinct values. There is no set of used values and
+no retry loop: every lookup is O(1) time and memory, and any row can be
+computed on its own. Values are built from the permuted index:
+
+- ``unique_digits``: fixed-width decimal numbers such as account numbers.
+- ``card_number``: a 16-digit number, issuer prefix plus unique account
+  part, with a Luhn check digit.
+- ``unique_token``: a fixed-width base-36 suffix used to make emails unique.
+
+The key comes from the seed and a name such as ``"cards.card_number"``, so
+each column gets its own unrelated-looking order.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+
+from counter_rng import mix64, stream_key
+
+FEISTEL_ROUNDS = 6
+
+# 6-digit issuer prefixes (Visa, Mastercard, RuPay); 9 account digits and a
+# Luhn check digit follow, giving 16-digit numbers.
+CARD_PREFIXES = ("421653", "438857", "524193", "552260", "607153", "652150")
+CARD_ACCOUNT_DIGITS = 9
+
+TOKEN_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+TOKEN_WIDTH = 6
+
+
+class FeistelPermutation:
+    """Keyed bijection of ``range(size)``.
+
+    A balanced Feistel network over ``half * half >= size`` values, with
+    SplitMix64 round functions and modular addition; values that land
+    outside ``range(size)`` are encrypted again (cycle walking) until they
+    land inside, which keeps the map a bijection.
+    """
+
+    def __init__(self, size: int, key: int) -> None:
+        if size < 1:
+            raise ValueError("permutation size must be positive")
+        self.size = size
+        self.half = math.isqrt(size - 1) + 1
+        self.round_keys = [mix64(key ^ mix64(r)) for r in range(FEISTEL_ROUNDS)]
+
+    def _encrypt(self, x: int) -> int:
+        half = self.half
+        left, right = divmod(x, half)
+        for round_key in self.round_keys:
+            left, right = right, (left + mix64(round_key ^ right)) % half
+        return left * half + right
+
+    def __call__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise ValueError(f"index {index} is outside a permutation of {self.size} values")
+        x = self._encrypt(index)
+        while x >= self.size:
+            x = self._encrypt(x)
+        return x
+
+
+@functools.lru_cache(maxsize=None)
+def permutation(seed: int, name: str, size: int) -> FeistelPermutation:
+    return FeistelPermutation(size, stream_key(seed, name, "unique"))
+
+
+def unique_digits(seed: int, name: str, digits: int, index: int) -> str:
+    """``digits``-digit number without a leading zero, unique per ``index``."""
+    low = 10 ** (digits - 1)
+    return str(low + permutation(seed, name, 9 * low)(index))
+
+
+def luhn_check_digit(payload: str) -> str:
+    """Digit that makes ``payload + digit`` pass the Luhn check."""
+    total = 0
+    for position, char in enumerate(reversed(payload)):
+        digit = int(char)
+        if position % 2 == 0:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return str(-total % 10)
+
+
+def card_number(seed: int, name: str, index: int) -> str:
+    """Luhn-valid 16-digit card number, unique per ``index``."""
+    accounts = 10**CARD_ACCOUNT_DIGITS
+    value = permutation(seed, name, len(CARD_PREFIXES) * accounts)(index)
+    prefix, account = divmod(value, accounts)
+    payload = f"{CARD_PREFIXES[prefix]}{account:0{CARD_ACCOUNT_DIGITS}d}"
+    return payload + luhn_check_digit(payload)
+
+
+def unique_token(seed: int, name: str, index: int) -> str:
+    """Fixed-width base-36 token, unique per ``index``."""
+    value = permutation(seed, name, len(TOKEN_ALPHABET) ** TOKEN_WIDTH)(index)
+    chars = []
+    for _ in range(TOKEN_WIDTH):
+        value, digit = divmod(value, len(TOKEN_ALPHABET))
+        chars.append(TOKEN_ALPHABET[digit])
+    return "".join(reversed(chars))
@@ -0,0 +1,338 @@
+"""Verify a database loaded by the 10-table loader against the rows the load generated.
+
+    python LoadMassiveDataWith10Tabel.py --customers 100000 --manifest bank.manifest.json
+    python verify_load.py --manifest bank.manifest.json
+
+or, without a manifest, with the options the load ran with:
+
+    python verify_load.py --customers 100000 --generator counter --workers 8
+
+Every table is checksummed on the server per id range, ``--threads`` ranges
+at a time: the row count plus the sum of the row hashes from
+``row_checksums`` (``SUM(CRC32(CONCAT_WS('|', ...)))`` on MySQL). The sums
+are compared with the expected ones:
+
+- With ``--manifest``, the sums the loader recorded while generating.
+- Otherwise the rows are generated again from the load options. DATE and
+  DATETIME columns are left out, as they are relative to the time of the load.
+
+A range whose sums differ is split in half until the differing ranges are
+``CHUNK_ROWS`` ids wide, so only those are narrowed further. Their rows are
+read back to list missing and unexpected ids. The changed rows are listed
+too when rows can be generated on their own: under ``--generator counter``,
+or after a load with ``--workers`` or ``--connections`` above 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+
+from db_backends import MySQLBackend, get_backend
+from LoadMassiveDataWith10Tabel import (
+    TABLE_LOADS,
+    TABLES,
+    PooledFaker,
+    all_batches,
+    batch_factory,
+    count_batches,
+    init_worker,
+    new_faker,
+    parse_args as parse_load_args,
+    primary_key,
+    shard_rows,
+    shard_seed,
+    split_shards,
+    table_slice,
+)
+from pipeline import progress
+from row_checksums import CHUNK_ROWS, ChecksumManifest, column_kind
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+
+@dataclass
+class Check:
+    """One id range of a table: ``CHUNK_ROWS``-id chunks, expected and server-side sums."""
+
+    table: str
+    chunks: range
+    expected: tuple[int, int]
+    actual: tuple[int, int] = (0, 0)
+
+    @property
+    def ids(self) -> tuple[int, int]:
+        """First and last id (inclusive) the range covers."""
+        return self.chunks.start * CHUNK_ROWS + 1, self.chunks.stop * CHUNK_ROWS
+
+    def halves(self, manifest: ChecksumManifest) -> tuple[Check, Check]:
+        middle = (self.chunks.start + self.chunks.stop) // 2
+        return tuple(
+            Check(self.table, chunks, manifest.expected(self.table, chunks))
+            for chunks in (range(self.chunks.start, middle), range(middle, self.chunks.stop))
+        )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="Every other option is read as a LoadMassiveDataWith10Tabel.py option "
+        "(connection, backend, row counts, seed and generator).",
+    )
+    parser.add_argument(
+        "--manifest", metavar="PATH", help="compare with the checksums a load wrote with --manifest PATH"
+    )
+    parser.add_argument("--threads", type=int, default=8, help="connections running checksum queries at once")
+    parser.add_argument("--show", type=int, default=10, help="differing ranges and ids listed per table")
+    parser.add_argument("--report", metavar="PATH", help="write a JSON report here when done")
+    own, rest = parser.parse_known_args(argv)
+    if own.threads < 1 or own.show < 0:
+        parser.error("--threads must be positive and --show not negative")
+    args = parse_load_args(rest)
+    if args.append or args.output_dir:
+        parser.error("only a fresh database load can be verified; drop --append or --output-dir")
+    for name, value in vars(own).items():
+        setattr(args, name, value)
+    return args
+
+
+def regenerated_checksums(args: argparse.Namespace, backend: MySQLBackend) -> ChecksumManifest:
+    """Checksums of the rows the load options generate, without their date columns."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from faker import Faker
+
+    columns = {
+        table.name: [
+            column.name for column in table.columns if column_kind(column.sql_type)[0] not in ("date", "datetime")
+        ]
+        for table in TABLES
+    }
+    checksums = ChecksumManifest(backend, TABLES, columns)
+    # Seeded exactly like the loader's main().
+    rng = random.Random(args.seed)
+    Faker.seed(args.seed)
+    fake = new_faker(args)
+    executor = (
+        ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker, initargs=(args,))
+        if args.workers > 1
+        else None
+    )
+    try:
+        for table, _, count_arg, plan in TABLE_LOADS:
+            count = getattr(args, count_arg)
+            batches = checksums.track(table, all_batches(args, fake, rng, executor, table, plan, count), 1)
+            for _ in progress(batches, total=count_batches(count, args.batch_size), desc=f"{table} regenerated"):
+                pass
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return checksums
+
+
+def rows_regenerable(args: argparse.Namespace) -> bool:
+    """Whether a chunk's rows can be generated without the rows before it."""
+    return args.generator == "counter" or args.workers > 1 or args.connections > 1
+
+
+def chunk_rows(
+    args: argparse.Namespace, fake: Faker | PooledFaker, table: str, chunk: int
+) -> Iterator[tuple[int, tuple]]:
+    """``(id, row)`` of every row chunk ``chunk`` of ``table`` should hold."""
+    _, _, count_arg, plan = next(load for load in TABLE_LOADS if load[0] == table)
+    start = chunk * CHUNK_ROWS
+    stop = min(start + CHUNK_ROWS, getattr(args, count_arg))
+    if args.generator == "counter":
+        rows = table_slice(args, table, start, stop, fake)
+    else:
+        # A chunk is one shard, generated from its own seed.
+        make_batch = batch_factory(table, plan, args.vectorized, args.generator)
+        rows = shard_rows(fake, make_batch, args, shard_seed(args.stream_seed, table, chunk), start, stop)
+    return enumerate(rows, start + 1)
+
+
+def run_queries(
+    backend: MySQLBackend, args: argparse.Namespace, queries: list[tuple[str, tuple]], desc: str
+) -> list[list[tuple]]:
+    """Every row of each of ``queries``, run on up to ``--threads`` connections."""
+    results: list[list[tuple]] = [[] for _ in queries]
+    pending = iter(enumerate(queries))
+    lock = threading.Lock()
+    errors: list[BaseException] = []
+    bar = progress(total=len(queries), unit="range", desc=desc, leave=False)
+
+    def work() -> None:
+        # Each thread connects on its own; SQLite connections stay on their thread.
+        try:
+            conn = backend.connect(args)
+            cur = conn.cursor()
+        except BaseException as exc:
+            errors.append(exc)
+            return
+        try:
+            backend.use_database(cur, args.database)
+            while not errors:
+                with lock:
+                    item = next(pending, None)
+                if item is None:
+                    break
+                index, (sql, params) = item
+                cur.execute(sql, params)
+                results[index] = cur.fetchall()
+                bar.update()
+        except BaseException as exc:
+            errors.append(exc)
+        finally:
+            cur.close()
+            conn.close()
+
+    threads = [threading.Thread(target=work, daemon=True) for _ in range(min(args.threads, len(queries)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    bar.close()
+    if errors:
+        raise errors[0]
+    return results
+
+
+def verify(backend: MySQLBackend, args: argparse.Namespace, expected: ChecksumManifest) -> dict[str, dict]:
+    """Compare every table with ``expected``; returns a result per table."""
+    ph = backend.placeholder
+    hashes, keys, results = {}, {}, {}
+    checks: list[Check] = []
+    for table in expected.columns:
+        types = {column.name: column.sql_type for column in expected.specs[table].columns}
+        hashes[table] = backend.row_hash_sql([(name, types[name]) for name in expected.columns[table]])
+        keys[table] = primary_key(table)
+        rows = expected.rows(table)
+        results[table] = {"rows": rows, "server_rows": 0, "differing_ranges": [], "missing_ids": []}
+        results[table].update(unexpected_ids=[], changed_ids=[], outside_range=0)
+        checks += [
+            Check(table, chunks, expected.expected(table, chunks))
+            for chunks in split_shards(rows, args.threads)
+            if chunks
+        ]
+
+    def sums(checks: list[Check], desc: str) -> list[tuple[int, int]]:
+        queries = [
+            (
+                f"SELECT COUNT(*), COALESCE(SUM({hashes[check.table]}), 0) FROM {check.table} "
+                f"WHERE {keys[check.table]} BETWEEN {ph} AND {ph}",
+                check.ids,
+            )
+            for check in checks
+        ]
+        return [(int(count), int(total)) for ((count, total),) in run_queries(backend, args, queries, desc)]
+
+    # Rows past the last expected chunk (or below id 1) are never in a range.
+    outside = [
+        (
+            f"SELECT COUNT(*) FROM {table} WHERE {keys[table]} < 1 OR {keys[table]} > {ph}",
+            (expected.chunk_count(table) * CHUNK_ROWS,),
+        )
+        for table in expected.columns
+    ]
+    for table, ((count,),) in zip(expected.columns, run_queries(backend, args, outside, "outside ranges")):
+        results[table]["outside_range"] = results[table]["server_rows"] = int(count)
+    for check, actual in zip(checks, sums(checks, "checksums")):
+        check.actual = actual
+        results[check.table]["server_rows"] += actual[0]
+
+    # Bisect: only the first half of a differing range is queried; the second is the rest.
+    leaves: list[Check] = []
+    level = 0
+    while checks:
+        differing = [check for check in checks if check.actual != check.expected]
+        leaves += [check for check in differing if len(check.chunks) == 1]
+        pairs = [(check, *check.halves(expected)) for check in differing if len(check.chunks) > 1]
+        level += 1
+        checks = []
+        actuals = sums([first for _, first, _ in pairs], f"bisect {level}")
+        for (parent, first, second), actual in zip(pairs, actuals):
+            first.actual = actual
+            second.actual = (parent.actual[0] - actual[0], parent.actual[1] - actual[1])
+            checks += [first, second]
+
+    # Differing chunks, read row by row.
+    leaves.sort(key=lambda leaf: (leaf.table, leaf.chunks.start))
+    queries = [
+        (
+            f"SELECT {keys[leaf.table]}, {hashes[leaf.table]} FROM {leaf.table} "
+            f"WHERE {keys[leaf.table]} BETWEEN {ph} AND {ph}",
+            leaf.ids,
+        )
+        for leaf in leaves
+    ]
+    fake = new_faker(args) if not args.manifest and rows_regenerable(args) else None
+    for leaf, found in zip(leaves, run_queries(backend, args, queries, "differing rows")):
+        result = results[leaf.table]
+        first, last = leaf.ids
+        result["differing_ranges"].append([first, last, leaf.expected[0], leaf.actual[0]])
+        server = {int(row_id): int(digest) for row_id, digest in found}
+        wanted = range(first, min(last, expected.rows(leaf.table)) + 1)
+        result["missing_ids"] += [row_id for row_id in wanted if row_id not in server]
+        result["unexpected_ids"] += [row_id for row_id in server if row_id not in wanted]
+        if fake is not None:
+            hasher = expected.hashers[leaf.table]
+            result["changed_ids"] += [
+                row_id
+                for row_id, row in chunk_rows(args, fake, leaf.table, leaf.chunks.start)
+                if row_id in server and server[row_id] != hasher(row_id, row)
+            ]
+    for result in results.values():
+        differs = result["differing_ranges"] or result["outside_range"]
+        result["status"] = "mismatch" if differs else "ok"
+    return results
+
+
+def print_results(results: dict[str, dict], show: int) -> None:
+    def listed(ids: list[int]) -> str:
+        more = f" and {len(ids) - show:,} more" if len(ids) > show else ""
+        return ", ".join(f"{row_id:,}" for row_id in ids[:show]) + more
+
+    print(f"\n{'table':<18} {'expected':>12} {'found':>12}  status")
+    for table, result in results.items():
+        print(f"{table:<18} {result['rows']:>12,} {result['server_rows']:>12,}  {result['status']}")
+        for first, last, rows, found in result["differing_ranges"][:show]:
+            print(f"    ids {first:,}-{last:,}: {rows:,} rows expected, {found:,} found")
+        if len(result["differing_ranges"]) > show:
+            print(f"    ... {len(result['differing_ranges']) - show:,} more differing ranges")
+        for label in ("missing", "unexpected", "changed"):
+            if result[f"{label}_ids"]:
+                print(f"    {label} ids: {listed(result[f'{label}_ids'])}")
+        if result["outside_range"]:
+            print(f"    {result['outside_range']:,} rows outside the expected id range")
+
+
+def main() -> None:
+    args = parse_args()
+    backend = get_backend(args.backend)
+    if args.manifest:
+        expected = ChecksumManifest.load(args.manifest, backend, TABLES)
+    else:
+        expected = regenerated_checksums(args, backend)
+    try:
+        results = verify(backend, args, expected)
+    except backend.errors as exc:
+        raise SystemExit(f"Database error: {exc}") from exc
+    print_results(results, args.show)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"Verification report written to {args.report}")
+    failed = [table for table, result in results.items() if result["status"] != "ok"]
+    if failed:
+        raise SystemExit(f"Verification failed for {', '.join(failed)}")
+    print("\n✅ Every table matches the expected rows")
+
+
+if __name__ == "__main__":
+    main()